@@ -0,0 +1,72 @@
+"""Negotiated response compression for the API.
+
+Like django.middleware.gzip.GZipMiddleware, but brotli is preferred when the
+client accepts it and the `brotli` package is installed, only bodies of at
+least API_COMPRESS_MIN_BYTES are touched (small ones grow or gain nothing),
+and streaming responses are left alone so Server-Sent Events are not held
+back in a compressor's buffer.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+_accepts_encoding = _lazy_re_compile(r"(?:^|,)\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?", re.IGNORECASE)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _accepted(header: str) -> set:
+    """Encodings the client accepts (q > 0) from an Accept-Encoding header."""
+    accepted = set()
+    for name, q in _accepts_encoding.findall(header or ""):
+        try:
+            if q == "" or float(q) > 0:
+                accepted.add(name.lower())
+        except ValueError:
+            continue
+    return accepted
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if not request.path.startswith(getattr(settings, "API_COMPRESS_PREFIX", "/api/")):
+            return response
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        # Whatever we decide, the body now depends on Accept-Encoding.
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if len(response.content) < getattr(settings, "API_COMPRESS_MIN_BYTES", 1024):
+            return response
+
+        accepted = _accepted(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+            body = brotli.compress(response.content, quality=getattr(settings, "API_BROTLI_QUALITY", 5))
+        elif "gzip" in accepted:
+            encoding = "gzip"
+            body = gzip.compress(response.content, compresslevel=getattr(settings, "API_GZIP_LEVEL", 6), mtime=0)
+        else:
+            return response
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        # The encoded bytes differ from the identity ones, so a strong ETag must become weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,31 @@
+"""orjson-backed JSON renderer for the REST APIs.
+
+Drop-in for rest_framework.renderers.JSONRenderer: same media type, compact
+UTF-8 output, and anything orjson can't encode natively (Decimal, lazy
+translation strings, ...) goes through DRF's own encoder. datetimes are
+encoded by orjson in isoformat() form, so read paths can hand them over as-is.
+"""
+import orjson
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback = JSONEncoder()
+
+
+def dumps(data, indent: bool = False) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(data, default=_fallback.default, option=option)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # The browsable API asks for indented output, like JSONRenderer honours.
+        indent = bool((renderer_context or {}).get("indent"))
+        return dumps(data, indent=indent)
@@ -83,6 +83,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'backend.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -182,6 +183,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+# Let browser clients read the home feed's staleness flag.
+CORS_EXPOSE_HEADERS = ['X-News-Stale']
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -217,13 +220,137 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 REST_FRAMEWORK = {
     # "EXCEPTION_HANDLER": "users.exceptions.custom_exception_handler"
+    "DEFAULT_RENDERER_CLASSES": (
+        "backend.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
+# Cache: Redis when REDIS_URL is set (shared by every worker process),
+# otherwise a per-process in-memory cache for development.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'bitmore',
+        }
+    }
+
 
 # News API Configuration
 # TODO: Get your API key from: https://newsdata.io/
 NEWSDATA_API_KEY = os.getenv('NEWSDATA_API_KEY', 'your-newsdata-api-key')
 
+# Per-attempt timeout (seconds) and retries for 429/5xx/network errors.
+NEWSDATA_TIMEOUT = float(os.getenv('NEWSDATA_TIMEOUT', '12'))
+NEWSDATA_MAX_RETRIES = int(os.getenv('NEWSDATA_MAX_RETRIES', '2'))
+
+# Circuit breaker: after this many failed calls in a row, stop calling the
+# provider for NEWSDATA_BREAKER_COOLDOWN seconds and serve stored news.
+NEWSDATA_BREAKER_THRESHOLD = int(os.getenv('NEWSDATA_BREAKER_THRESHOLD', '5'))
+NEWSDATA_BREAKER_COOLDOWN = int(os.getenv('NEWSDATA_BREAKER_COOLDOWN', '60'))
+
+# Stale home sections are fetched in parallel through a bounded pool; sections
+# not back within the deadline (seconds) are served from the DB instead.
+NEWS_FETCH_WORKERS = int(os.getenv('NEWS_FETCH_WORKERS', '4'))
+NEWS_FETCH_DEADLINE = float(os.getenv('NEWS_FETCH_DEADLINE', '15'))
+
+# Background ingestion: `python manage.py refresh_news --loop` refreshes these
+# COUNTRY:LANGUAGE locales every NEWS_INGEST_INTERVAL seconds. The API views
+# only read; with NEWS_REVALIDATE_ON_READ they also queue an off-thread refresh
+# for stale sections (turn it off when the worker is running).
+NEWS_INGEST_LOCALES = [l.strip() for l in os.getenv('NEWS_INGEST_LOCALES', 'us:en').split(',') if l.strip()]
+NEWS_INGEST_INTERVAL = int(os.getenv('NEWS_INGEST_INTERVAL', '900'))
+NEWS_REVALIDATE_ON_READ = os.getenv('NEWS_REVALIDATE_ON_READ', 'True').lower() == 'true'
+
+# Batched mode: pack up to NEWSDATA_MAX_CATEGORIES categories into one provider
+# call and follow nextPage until each section has NEWS_BATCH_QUOTA items. A
+# group never reads more pages than it has sections, so it costs at most the
+# calls of the per-section path; it only saves calls with pages bigger than
+# the quota, so set NEWSDATA_PAGE_SIZE to your plan's maximum (10 on the free
+# plan, 50 on paid ones).
+NEWS_INGEST_BATCHED = os.getenv('NEWS_INGEST_BATCHED', 'False').lower() == 'true'
+NEWSDATA_MAX_CATEGORIES = 5
+NEWSDATA_PAGE_SIZE = int(os.getenv('NEWSDATA_PAGE_SIZE', '10'))
+NEWS_BATCH_QUOTA = int(os.getenv('NEWS_BATCH_QUOTA', '12'))
+NEWS_BATCH_MAX_PAGES = int(os.getenv('NEWS_BATCH_MAX_PAGES', '5'))
+
+# A section/locale is fresh for NEWS_FETCH_TTL seconds after a successful fetch,
+# or NEWS_FETCH_RETRY_TTL seconds after an empty or timed-out one.
+NEWS_FETCH_TTL = int(os.getenv('NEWS_FETCH_TTL', str(3 * 60 * 60)))
+NEWS_FETCH_RETRY_TTL = int(os.getenv('NEWS_FETCH_RETRY_TTL', str(5 * 60)))
+
+# Only one process refreshes a given section/locale at a time; the lease it
+# holds in the cache expires after this many seconds if the process dies.
+# Keep it well above the longest refresh (NEWS_FETCH_DEADLINE plus storing):
+# off Redis, release is not atomic (see news.locks).
+NEWS_REFRESH_LEASE = int(os.getenv('NEWS_REFRESH_LEASE', '60'))
+
+# Near-duplicate collapsing at ingestion: stories whose title+summary SimHash is
+# within NEWS_DEDUPE_DISTANCE bits of a row fetched in the last
+# NEWS_DEDUPE_WINDOW_DAYS days are stored as alt_sources of that row.
+NEWS_DEDUPE_ENABLED = os.getenv('NEWS_DEDUPE_ENABLED', 'True').lower() == 'true'
+NEWS_DEDUPE_DISTANCE = int(os.getenv('NEWS_DEDUPE_DISTANCE', '3'))
+NEWS_DEDUPE_WINDOW_DAYS = int(os.getenv('NEWS_DEDUPE_WINDOW_DAYS', '3'))
+
+# Retention (purge_news): rows fetched more than max_age_days ago, or beyond a
+# bucket's newest max_rows, are deleted. Per-bucket entries override "default";
+# None disables a limit. Deletes run NEWS_PURGE_CHUNK primary keys at a time.
+NEWS_RETENTION = {
+    'default': {
+        'max_age_days': int(os.getenv('NEWS_RETENTION_DAYS', '30')),
+        'max_rows': int(os.getenv('NEWS_RETENTION_ROWS', '5000')),
+    },
+    # 'world': {'max_age_days': 7, 'max_rows': 2000},
+}
+NEWS_PURGE_CHUNK = int(os.getenv('NEWS_PURGE_CHUNK', '1000'))
+# Purged articles leave tombstones for delta-sync clients (/api/news/sync/);
+# clients that haven't synced for longer than this must resync from scratch.
+NEWS_SYNC_TOMBSTONE_DAYS = int(os.getenv('NEWS_SYNC_TOMBSTONE_DAYS', '30'))
+
+# NewsConfig is cached in each process and rechecked against the shared cache
+# after this many seconds; admin changes reach every worker within it.
+NEWS_CONFIG_TTL = int(os.getenv('NEWS_CONFIG_TTL', '30'))
+
+# Live updates (/api/news/stream/, ASGI): each worker polls for new articles
+# every NEWS_LIVE_POLL seconds while clients are connected; streams send a
+# heartbeat every NEWS_LIVE_HEARTBEAT seconds and close after NEWS_LIVE_MAX_AGE
+# (browsers reconnect and resume from Last-Event-ID).
+NEWS_LIVE_POLL = float(os.getenv('NEWS_LIVE_POLL', '2'))
+NEWS_LIVE_HEARTBEAT = int(os.getenv('NEWS_LIVE_HEARTBEAT', '15'))
+NEWS_LIVE_MAX_AGE = int(os.getenv('NEWS_LIVE_MAX_AGE', '300'))
+# A reconnect that missed more articles than this gets a "reset" event (reload) instead of a replay.
+NEWS_LIVE_MAX_CATCH_UP = int(os.getenv('NEWS_LIVE_MAX_CATCH_UP', '1000'))
+
+# HTTP caching of home/category responses: browsers revalidate after
+# NEWS_HTTP_MAX_AGE seconds (a cheap 304 via ETag), shared caches such as a
+# reverse proxy may serve a response for NEWS_HTTP_S_MAXAGE seconds.
+NEWS_HTTP_MAX_AGE = int(os.getenv('NEWS_HTTP_MAX_AGE', '0'))
+NEWS_HTTP_S_MAXAGE = int(os.getenv('NEWS_HTTP_S_MAXAGE', '60'))
+
+# Every worker on a host maps the same snapshot file of all sections (see
+# news.shared). Off unless set. Use a local directory only this deployment
+# can write, never a shared temp dir: another deployment or user writing the
+# same path would have its feed served here.
+NEWS_SHARED_SNAPSHOT = os.getenv('NEWS_SHARED_SNAPSHOT', '')
+
+# /api/ responses of at least API_COMPRESS_MIN_BYTES are sent brotli- (if the
+# `brotli` package is installed) or gzip-encoded, whichever the client accepts.
+API_COMPRESS_MIN_BYTES = int(os.getenv('API_COMPRESS_MIN_BYTES', '1024'))
+API_GZIP_LEVEL = int(os.getenv('API_GZIP_LEVEL', '6'))
+API_BROTLI_QUALITY = int(os.getenv('API_BROTLI_QUALITY', '5'))
+
+# Cached home/category responses live this many seconds at most; ingestion
+# invalidates them as soon as it writes to a bucket.
+NEWS_CACHE_TTL = int(os.getenv('NEWS_CACHE_TTL', '600'))
+
 # Google OAuth Configuration  
 # TODO: Get your Google Client ID from: https://console.developers.google.com/
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', 'your-google-client-id')
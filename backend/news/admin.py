@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import NewsConfig, NewsArticle
+from .models import NewsConfig, NewsArticle, NewsFetchLog
 
 
 @admin.register(NewsConfig)
@@ -15,3 +15,10 @@ class NewsArticleAdmin(admin.ModelAdmin):
     list_display = ("title", "category", "pubDate", "fetched_at")
     list_filter = ("category", "fetched_at")
     search_fields = ("title", "summary", "url")
+
+
+@admin.register(NewsFetchLog)
+class NewsFetchLogAdmin(admin.ModelAdmin):
+    list_display = ("bucket", "country", "language", "outcome", "item_count", "fetched_at")
+    list_filter = ("outcome", "country", "language")
+    ordering = ("country", "language", "bucket")
@@ -0,0 +1,101 @@
+"""Circuit breaker around the Newsdata provider, with its state in the shared cache.
+
+closed     calls go through; consecutive failures are counted.
+open       after NEWSDATA_BREAKER_THRESHOLD failures in a row every call fails
+           fast for NEWSDATA_BREAKER_COOLDOWN seconds.
+half_open  after the cooldown a single probe call is let through (guarded by
+           cache.add, so one probe across all workers); success closes the
+           breaker, failure opens it again.
+
+Like the refresh leases, the state is only shared between processes when the
+cache is (REDIS_URL).
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state_key = f"news:breaker:{name}:state"
+        self.failures_key = f"news:breaker:{name}:failures"
+        self.probe_key = f"news:breaker:{name}:probe"
+
+    def _load(self):
+        found = cache.get_many([self.state_key, self.failures_key])
+        state = found.get(self.state_key) or {"state": CLOSED, "opened_at": 0}
+        return state, found.get(self.failures_key, 0)
+
+    def _set_state(self, old: str, new: str) -> None:
+        cache.set(self.state_key, {"state": new, "opened_at": time.time()}, None)
+        if old != new:
+            log = logger.info if new == CLOSED else logger.warning
+            log("Circuit breaker %r: %s -> %s", self.name, old, new)
+
+    @property
+    def state(self) -> str:
+        return self._load()[0]["state"]
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected without even a probe."""
+        state, _ = self._load()
+        return state["state"] == OPEN and time.time() - state["opened_at"] < self.reset_timeout
+
+    def allow(self) -> bool:
+        """May a call go out now? In half-open, only the one probe may."""
+        state, _ = self._load()
+        if state["state"] == CLOSED:
+            return True
+        if state["state"] == OPEN and time.time() - state["opened_at"] < self.reset_timeout:
+            return False
+        # Cooldown over (or a half-open probe that never reported back expired).
+        if cache.add(self.probe_key, 1, self.reset_timeout):
+            if state["state"] != HALF_OPEN:
+                self._set_state(state["state"], HALF_OPEN)
+            return True
+        return False
+
+    def record_success(self) -> None:
+        state, failures = self._load()
+        if state["state"] != CLOSED:
+            self._set_state(state["state"], CLOSED)
+            cache.delete(self.probe_key)
+        if failures:
+            cache.delete(self.failures_key)
+
+    def record_failure(self) -> None:
+        state, _ = self._load()
+        if state["state"] != CLOSED:
+            # The half-open probe failed: back to a full cooldown.
+            self._set_state(state["state"], OPEN)
+            cache.delete(self.probe_key)
+            return
+
+        try:
+            failures = cache.incr(self.failures_key)
+        except ValueError:
+            cache.add(self.failures_key, 1, None)
+            failures = 1
+        if failures >= self.failure_threshold:
+            self._set_state(CLOSED, OPEN)
+            cache.delete(self.failures_key)
+
+
+def get_breaker() -> CircuitBreaker:
+    """The Newsdata breaker; cheap to build, all state lives in the cache."""
+    return CircuitBreaker(
+        "newsdata",
+        failure_threshold=getattr(settings, "NEWSDATA_BREAKER_THRESHOLD", 5),
+        reset_timeout=getattr(settings, "NEWSDATA_BREAKER_COOLDOWN", 60),
+    )
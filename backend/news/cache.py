@@ -0,0 +1,167 @@
+"""Server-side response cache for the news endpoints.
+
+Entries are keyed by (endpoint, category, country, language) plus the current
+generation of every bucket the response covers. Ingestion bumps a bucket's
+generation whenever it writes rows (see invalidate_buckets), which moves every
+response containing that bucket to a fresh key; the old entries simply age out.
+The same digest doubles as the response's ETag, so conditional GETs are
+answered from the generations (plus the views' freshness check, whose stale
+buckets go into `extra`) without reading any articles.
+
+Generations only work as validators if every process sees the same ones. A
+per-process cache (LocMemCache, DummyCache) can't promise that: a writer in
+another process (refresh_news --loop, backfill_news) bumps only its own copy.
+There the generations come from the database instead, as the build time of
+each bucket's NewsSectionSnapshot, which every write path rebuilds.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Max
+
+from .models import NewsFetchLog, NewsSectionSnapshot
+
+GEN_PREFIX = "news:gen:"
+STATS_PREFIX = "news:stats:"
+
+# Not a bucket: its generation moves whenever NewsFetchLog is written (news.shared
+# copies the log), from the newest fetched_at without a shared cache.
+FETCH_LOG = "fetch-log"
+
+
+def _gen_key(bucket: str) -> str:
+    return f"{GEN_PREFIX}{bucket}"
+
+
+def cache_is_shared() -> bool:
+    """True unless the default cache lives in this process only."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _built_ns(built_at) -> int:
+    return int(built_at.timestamp() * 1_000_000) * 1000
+
+
+def _snapshot_builds(buckets):
+    return NewsSectionSnapshot.objects.filter(bucket__in=[b for b in buckets if b != FETCH_LOG]).values_list(
+        "bucket", "built_at"
+    )
+
+
+def _db_generations(buckets, built: dict) -> dict:
+    return {b: _built_ns(built[b]) if built.get(b) else 0 for b in buckets}
+
+
+def bucket_generations(buckets) -> dict:
+    """Current generation of each bucket, in one cache round-trip (a query or two without a shared cache)."""
+    buckets = list(buckets)
+    if not cache_is_shared():
+        built = dict(_snapshot_builds(buckets))
+        if FETCH_LOG in buckets:
+            built[FETCH_LOG] = NewsFetchLog.objects.aggregate(at=Max("fetched_at"))["at"]
+        return _db_generations(buckets, built)
+    keys = {_gen_key(b): b for b in buckets}
+    found = cache.get_many(list(keys))
+    missing = {k: time.time_ns() for k in keys if k not in found}
+    if missing:
+        # Never evicted back to an old value: a new generation is always new.
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {keys[k]: found[k] for k in keys}
+
+
+def invalidate_buckets(buckets) -> None:
+    """Bump the generation of `buckets`, orphaning every cached response that includes them."""
+    now = time.time_ns()
+    cache.set_many({_gen_key(b): now for b in buckets}, None)
+
+
+async def abucket_generations(buckets) -> dict:
+    """bucket_generations through the async cache API."""
+    buckets = list(buckets)
+    if not cache_is_shared():
+        built = {bucket: built_at async for bucket, built_at in _snapshot_builds(buckets)}
+        if FETCH_LOG in buckets:
+            built[FETCH_LOG] = (await NewsFetchLog.objects.aaggregate(at=Max("fetched_at")))["at"]
+        return _db_generations(buckets, built)
+    keys = {_gen_key(b): b for b in buckets}
+    found = await cache.aget_many(list(keys))
+    missing = {k: time.time_ns() for k in keys if k not in found}
+    if missing:
+        await cache.aset_many(missing, None)
+        found.update(missing)
+    return {keys[k]: found[k] for k in keys}
+
+
+def _response_version(endpoint, generations, country, language, category, extra):
+    raw = "|".join(
+        [endpoint, category, country or "", language or "", extra]
+        + [f"{b}={generations[b]}" for b in sorted(generations)]
+    )
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    # Generations are write times, so the newest one is when the response last changed.
+    return "news:body:" + digest, digest, max(generations.values(), default=0) // 1_000_000_000
+
+
+def response_version(endpoint: str, buckets, country="", language="", category="", extra="", generations=None):
+    """(cache key, ETag value, Last-Modified timestamp) of a response, from the bucket generations alone.
+
+    `extra` carries any other request parameter that changes the response (e.g. a page cursor).
+    Pass `generations` if the caller already fetched them for `buckets`.
+    """
+    generations = generations if generations is not None else bucket_generations(buckets)
+    return _response_version(endpoint, generations, country, language, category, extra)
+
+
+async def aresponse_version(endpoint: str, buckets, country="", language="", category="", extra="", generations=None):
+    generations = generations if generations is not None else await abucket_generations(buckets)
+    return _response_version(endpoint, generations, country, language, category, extra)
+
+
+def _count(name: str) -> None:
+    key = f"{STATS_PREFIX}{name}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_cached_response(key: str):
+    """Cached response body for `key` (encoded JSON bytes) or None; counts the hit/miss."""
+    payload = cache.get(key)
+    _count("hits" if payload is not None else "misses")
+    return payload
+
+
+async def _acount(name: str) -> None:
+    key = f"{STATS_PREFIX}{name}"
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 1, None)
+
+
+async def aget_cached_response(key: str):
+    payload = await cache.aget(key)
+    await _acount("hits" if payload is not None else "misses")
+    return payload
+
+
+def set_cached_response(key: str, body) -> None:
+    cache.set(key, body, getattr(settings, "NEWS_CACHE_TTL", 600))
+
+
+async def aset_cached_response(key: str, body) -> None:
+    await cache.aset(key, body, getattr(settings, "NEWS_CACHE_TTL", 600))
+
+
+def cache_stats() -> dict:
+    found = cache.get_many([f"{STATS_PREFIX}hits", f"{STATS_PREFIX}misses"])
+    hits = found.get(f"{STATS_PREFIX}hits", 0)
+    misses = found.get(f"{STATS_PREFIX}misses", 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None}
@@ -0,0 +1,316 @@
+"""Shared HTTP client for the Newsdata API.
+
+One pooled requests.Session per process, so calls reuse keep-alive
+connections instead of paying a TCP+TLS handshake per bucket. Transient
+failures (network errors, 429, 5xx) are retried with jittered exponential
+backoff that honours Retry-After; everything else fails fast with
+NewsdataError. Calls go through the circuit breaker in news.breaker. Every
+attempt is timed and counted in `metrics`.
+
+AsyncNewsdataClient is the same client on httpx.AsyncClient, for refreshes
+run on the ASGI event loop; it shares the breaker, retry policy and metrics.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+
+from .breaker import get_breaker
+
+logger = logging.getLogger(__name__)
+
+# Newsdata: prefer the /news endpoint (stable)
+NEWSDATA_URL = "https://newsdata.io/api/1/news"
+
+# Failures worth another attempt, and the ones that count against the breaker.
+RETRYABLE_OUTCOMES = ("network", "rate_limited", "server_error")
+OUTAGE_OUTCOMES = RETRYABLE_OUTCOMES + ("bad_response",)
+
+
+class NewsdataError(Exception):
+    """The provider call failed; `outcome` says how (see NewsdataMetrics)."""
+
+    def __init__(self, message, outcome="error", retry_after=None):
+        super().__init__(message)
+        self.outcome = outcome
+        self.retry_after = retry_after
+
+
+class NewsdataMetrics:
+    """Thread-safe per-process call counters and latency totals, by outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, outcome: str, seconds: float) -> None:
+        with self._lock:
+            stat = self._stats.setdefault(outcome, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            ms = seconds * 1000
+            stat["count"] += 1
+            stat["total_ms"] += ms
+            stat["max_ms"] = max(stat["max_ms"], ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                outcome: {
+                    "count": s["count"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 1),
+                    "max_ms": round(s["max_ms"], 1),
+                }
+                for outcome, s in self._stats.items()
+            }
+
+
+def _parse_retry_after(value):
+    """Retry-After as seconds; it may be a delay or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode_response(resp) -> dict:
+    """Success payload of a requests/httpx response, or NewsdataError saying what went wrong."""
+    if resp.status_code == 429:
+        raise NewsdataError("rate limited", "rate_limited", _parse_retry_after(resp.headers.get("Retry-After")))
+    if resp.status_code >= 500:
+        raise NewsdataError(
+            f"HTTP {resp.status_code}", "server_error", _parse_retry_after(resp.headers.get("Retry-After"))
+        )
+
+    try:
+        data = resp.json()
+    except ValueError:
+        raise NewsdataError(f"HTTP {resp.status_code} with a non-JSON body", "bad_response") from None
+    if not isinstance(data, dict) or data.get("status") != "success":
+        detail = data.get("results") if isinstance(data, dict) else None
+        raise NewsdataError(f"HTTP {resp.status_code}, provider error: {detail!r}", "provider_error")
+    return data
+
+
+class NewsdataClient:
+    def __init__(self, timeout=12, max_retries=2, backoff=0.5, backoff_max=10.0, pool_size=10, metrics=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.metrics = metrics or NewsdataMetrics()
+        self.session = self._make_session()
+
+    def _make_session(self):
+        session = requests.Session()
+        # Retries are ours (jitter, Retry-After, metrics); urllib3 must not add its own.
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+        return session
+
+    def get(self, params: dict, url: str = NEWSDATA_URL) -> dict:
+        """GET `url` and return the decoded success payload.
+
+        Goes through the circuit breaker: while it is open this raises
+        NewsdataError("circuit_open") without touching the network.
+        """
+        breaker = self._enter_breaker()
+        try:
+            data = self._get_with_retries(url, params)
+        except NewsdataError as exc:
+            self._report(breaker, exc)
+            raise
+        breaker.record_success()
+        return data
+
+    def _enter_breaker(self):
+        breaker = get_breaker()
+        if not breaker.allow():
+            self.metrics.record("circuit_open", 0)
+            raise NewsdataError("circuit open, provider calls suspended", "circuit_open")
+        return breaker
+
+    @staticmethod
+    def _report(breaker, exc: NewsdataError) -> None:
+        if exc.outcome in OUTAGE_OUTCOMES:
+            breaker.record_failure()
+        else:
+            # The provider answered; a bad request is not an outage.
+            breaker.record_success()
+
+    def _get_with_retries(self, url: str, params: dict) -> dict:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._attempt(url, params)
+            except NewsdataError as exc:
+                retryable = exc.outcome in RETRYABLE_OUTCOMES
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, exc.retry_after)
+                if delay is None:
+                    raise
+                logger.info("Newsdata %s, retrying in %.1fs (attempt %d)", exc.outcome, delay, attempt + 1)
+                time.sleep(delay)
+
+    def _attempt(self, url: str, params: dict) -> dict:
+        started = time.monotonic()
+        outcome = "ok"
+        try:
+            try:
+                resp = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as exc:
+                # Not str(exc): it echoes the URL, api key included.
+                raise NewsdataError(f"network error ({type(exc).__name__})", "network") from None
+
+            return _decode_response(resp)
+        except NewsdataError as exc:
+            outcome = exc.outcome
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self.metrics.record(outcome, elapsed)
+            logger.debug("Newsdata %s %s in %.0fms", params.get("category"), outcome, elapsed * 1000)
+
+    def _backoff(self, attempt: int, retry_after=None):
+        """Full-jitter exponential delay, but never sooner than Retry-After.
+
+        Returns None when the server asks us to wait longer than backoff_max;
+        waiting that long inside a refresh is worse than giving up.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+        if retry_after is not None:
+            if retry_after > self.backoff_max:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+async def _close_on_shutdown(session: httpx.AsyncClient):
+    """Parked async generator: the loop's shutdown_asyncgens() (asyncio.run, ASGI servers) resumes it to aclose()."""
+    try:
+        yield
+    finally:
+        await session.aclose()
+
+
+class AsyncNewsdataClient(NewsdataClient):
+    """NewsdataClient for the event loop: same breaker, retries and metrics, on httpx.
+
+    An httpx.AsyncClient belongs to the loop it was first used on, so one is
+    kept per running loop, and closed when that loop shuts down.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._sessions = {}
+        super().__init__(*args, **kwargs)
+
+    def _make_session(self):
+        return None  # per loop, see _session
+
+    async def _session(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(loop)
+        if entry is None:
+            # A loop closed without shutdown_asyncgens() took its client's sockets with it; just forget it.
+            for other in [l for l in self._sessions if l.is_closed()]:
+                del self._sessions[other]
+            session = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                headers={"Accept": "application/json", "Accept-Encoding": "gzip, deflate"},
+            )
+            closer = _close_on_shutdown(session)
+            await closer.__anext__()
+            entry = self._sessions[loop] = (session, closer)
+        return entry[0]
+
+    async def get(self, params: dict, url: str = NEWSDATA_URL) -> dict:
+        # Breaker state is in the cache; its calls run in a thread, not on the loop.
+        breaker = await sync_to_async(self._enter_breaker)()
+        try:
+            data = await self._get_with_retries(url, params)
+        except NewsdataError as exc:
+            await sync_to_async(self._report)(breaker, exc)
+            raise
+        await sync_to_async(breaker.record_success)()
+        return data
+
+    async def _get_with_retries(self, url: str, params: dict) -> dict:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._attempt(url, params)
+            except NewsdataError as exc:
+                if exc.outcome not in RETRYABLE_OUTCOMES or attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, exc.retry_after)
+                if delay is None:
+                    raise
+                logger.info("Newsdata %s, retrying in %.1fs (attempt %d)", exc.outcome, delay, attempt + 1)
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, url: str, params: dict) -> dict:
+        started = time.monotonic()
+        outcome = "ok"
+        session = await self._session()
+        try:
+            try:
+                resp = await session.get(url, params=params)
+            except httpx.HTTPError as exc:
+                raise NewsdataError(f"network error ({type(exc).__name__})", "network") from None
+            return _decode_response(resp)
+        except NewsdataError as exc:
+            outcome = exc.outcome
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self.metrics.record(outcome, elapsed)
+            logger.debug("Newsdata %s %s in %.0fms (async)", params.get("category"), outcome, elapsed * 1000)
+
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> NewsdataClient:
+    """The process-wide client, created on first use from settings."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NewsdataClient(
+                timeout=getattr(settings, "NEWSDATA_TIMEOUT", 12),
+                max_retries=getattr(settings, "NEWSDATA_MAX_RETRIES", 2),
+                pool_size=max(10, getattr(settings, "NEWS_FETCH_WORKERS", 4)),
+            )
+        return _client
+
+
+def get_async_client() -> AsyncNewsdataClient:
+    """The process-wide async client; its metrics are the sync client's, so stats cover both."""
+    global _async_client
+    metrics = get_client().metrics
+    with _client_lock:
+        if _async_client is None:
+            _async_client = AsyncNewsdataClient(
+                timeout=getattr(settings, "NEWSDATA_TIMEOUT", 12),
+                max_retries=getattr(settings, "NEWSDATA_MAX_RETRIES", 2),
+                pool_size=max(10, getattr(settings, "NEWS_FETCH_WORKERS", 4)),
+                metrics=metrics,
+            )
+        return _async_client
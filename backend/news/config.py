@@ -0,0 +1,62 @@
+"""Cached access to the NewsConfig singleton.
+
+get_news_config() keeps the row in process memory. For NEWS_CONFIG_TTL
+seconds it is returned without touching the database or the cache. After
+that, one cache read of the shared config version decides whether the copy is
+still current. Saving or deleting a NewsConfig bumps that version once the
+transaction commits (news.signals), so every worker reloads within a TTL. As
+with the refresh leases, that only crosses processes when the cache is shared
+(REDIS_URL).
+
+The returned instance is shared by every request in the process; read it,
+don't modify it.
+"""
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import NewsConfig
+
+VERSION_KEY = "news:config:version"
+
+_lock = threading.Lock()
+_cached = {"config": None, "version": None, "checked": 0.0}
+
+
+def get_news_config() -> NewsConfig:
+    now = time.monotonic()
+    config = _cached["config"]
+    if config is not None and now - _cached["checked"] < getattr(settings, "NEWS_CONFIG_TTL", 30):
+        return config
+
+    with _lock:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            version = time.time_ns()
+            cache.add(VERSION_KEY, version, None)
+            version = cache.get(VERSION_KEY, version)
+        if _cached["config"] is None or _cached["version"] != version:
+            _cached["config"], _ = NewsConfig.objects.get_or_create(id=1)
+            _cached["version"] = version
+        _cached["checked"] = now
+        return _cached["config"]
+
+
+async def aget_news_config() -> NewsConfig:
+    """get_news_config for async views; the fast path does no I/O at all."""
+    now = time.monotonic()
+    config = _cached["config"]
+    if config is not None and now - _cached["checked"] < getattr(settings, "NEWS_CONFIG_TTL", 30):
+        return config
+    # Rare (once per TTL); the locking and ORM access stay on the sync side.
+    return await sync_to_async(get_news_config)()
+
+
+def invalidate_news_config() -> None:
+    """Make every process reload the config on its next check."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    with _lock:
+        _cached["config"] = None
@@ -0,0 +1,78 @@
+"""Near-duplicate detection for incoming articles (SimHash).
+
+Each article gets a 64-bit SimHash of its normalized title + summary. Two
+articles are near-duplicates when their fingerprints differ in at most
+NEWS_DEDUPE_DISTANCE bits. Lookups go through a band index: the fingerprint
+is cut into distance+1 bands, and by the pigeonhole principle any match
+within the distance shares at least one band exactly, so only the few
+candidates in the same band buckets are compared.
+"""
+import hashlib
+import re
+from collections import Counter, defaultdict
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_MASK = (1 << 64) - 1
+SHINGLE = 4
+
+
+def _features(text: str) -> Counter:
+    normalized = " ".join(_WORD_RE.findall((text or "").lower()))
+    if len(normalized) <= SHINGLE:
+        return Counter([normalized] if normalized else [])
+    # Character shingles rather than words: headlines are short, and a reworded
+    # clause flips far fewer features this way.
+    return Counter(normalized[i:i + SHINGLE] for i in range(len(normalized) - SHINGLE + 1))
+
+
+def simhash(text: str):
+    """Signed 64-bit SimHash of `text` (fits a BigIntegerField), or None if there is nothing to hash."""
+    features = _features(text)
+    if not features:
+        return None
+    weights = [0] * 64
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += count if h >> bit & 1 else -count
+    value = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            value |= 1 << bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def article_fingerprint(title: str, summary: str):
+    return simhash(f"{title or ''} {summary or ''}")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count("1")
+
+
+class SimHashIndex:
+    """In-memory band index over fingerprints; find() returns the key of a near match."""
+
+    def __init__(self, distance: int = 3):
+        self.distance = distance
+        self.bands = distance + 1
+        self.width = 64 // self.bands
+        self._buckets = defaultdict(list)
+
+    def _band_keys(self, fp: int):
+        fp &= _MASK
+        for band in range(self.bands):
+            # The last band takes any leftover bits.
+            width = 64 - self.width * band if band == self.bands - 1 else self.width
+            yield band, (fp >> (band * self.width)) & ((1 << width) - 1)
+
+    def add(self, fp: int, key) -> None:
+        for band_key in self._band_keys(fp):
+            self._buckets[band_key].append((fp, key))
+
+    def find(self, fp: int):
+        for band_key in self._band_keys(fp):
+            for other, key in self._buckets.get(band_key, ()):
+                if hamming(fp, other) <= self.distance:
+                    return key
+        return None
@@ -0,0 +1,763 @@
+"""Newsdata ingestion: the write path for the news sections.
+
+Everything here talks to the provider and/or writes NewsArticle rows. The API
+views only read; they call into this module at most to schedule a background
+refresh (see schedule_refresh), and the refresh_news command drives it on a
+timer.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .breaker import get_breaker
+from .cache import FETCH_LOG, invalidate_buckets
+from .client import NewsdataError, get_async_client, get_client
+from .dedupe import SimHashIndex, article_fingerprint
+from .locks import acquire_lease, release_lease
+from .models import NewsArticle, NewsFetchLog
+from .search import index_articles
+from .shared import publish_shared_snapshot
+from .snapshots import publish_buckets
+from .sync import next_change_version
+
+logger = logging.getLogger(__name__)
+
+# Our sections -> the Newsdata categories that feed them.
+SECTIONS = {
+    "technology": ["technology"],
+    "politics": ["politics"],
+    "education": ["education"],
+    "business": ["business"],
+    "sports": ["sports"],
+    "health": ["health"],
+    "entertainment": ["entertainment"],
+    "world": ["world"],
+}
+
+
+# ------ Provider ------
+
+def _normalize_item(item: dict) -> dict:
+    """Convert a NewsData.io item into a consistent dict our frontend expects."""
+    return {
+        "title": item.get("title"),
+        "summary": item.get("description") or item.get("content"),
+        "url": item.get("link"),
+        "image": item.get("image_url"),
+        "source": item.get("source_id"),
+        "pubDate": item.get("pubDate"),
+        "category": item.get("category") or [],
+        "country": item.get("country") or [],
+    }
+
+
+def _build_params(categories=None, country=None, language="en"):
+    api_key = getattr(settings, "NEWSDATA_API_KEY", None)
+    if not api_key:
+        return None
+
+    params = {"apikey": api_key, "language": language}
+    # Without `size` the provider sends 10 per page whatever the plan allows.
+    size = getattr(settings, "NEWSDATA_PAGE_SIZE", None)
+    if size:
+        params["size"] = size
+    if categories:
+        params["category"] = ",".join(categories) if isinstance(categories, (list, tuple)) else str(categories)
+    if country:
+        params["country"] = ",".join(country) if isinstance(country, (list, tuple)) else str(country)
+    return params
+
+
+def fetch_newsdata_page(categories=None, country=None, language="en", page=None):
+    """Fetch one page from Newsdata; returns (normalized items, nextPage cursor or None).
+
+    Items are None if the provider call failed, so callers can tell an
+    outage from an empty answer.
+    """
+    params = _build_params(categories, country, language)
+    if params is None:
+        return [], None
+    if page:
+        params["page"] = page
+
+    try:
+        data = get_client().get(params)
+    except NewsdataError as exc:
+        logger.warning("Newsdata fetch failed for %s (%s/%s): %s", params.get("category"), country, language, exc)
+        return None, None
+    results = data.get("results") or []
+    return [_normalize_item(x) for x in results], data.get("nextPage") or None
+
+
+def fetch_from_newsdata(categories=None, country=None, language="en"):
+    """Call the external Newsdata API once and normalize results (None if the call failed)."""
+    items, _ = fetch_newsdata_page(categories, country, language)
+    return items
+
+
+def _run_with_deadline(tasks: dict) -> dict:
+    """Run {key: callable} in parallel, bounded by NEWS_FETCH_WORKERS.
+
+    Returns {key: result} for the tasks that finished within
+    NEWS_FETCH_DEADLINE seconds; the rest are left out so the caller can fall
+    back to what is already in the DB.
+    """
+    if not tasks:
+        return {}
+
+    workers = min(len(tasks), getattr(settings, "NEWS_FETCH_WORKERS", 4))
+    deadline = getattr(settings, "NEWS_FETCH_DEADLINE", 15)
+
+    # Worker threads only do HTTP; all DB writes stay on the calling thread.
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="newsdata")
+    futures = {pool.submit(task): key for key, task in tasks.items()}
+    done, _ = wait(futures, timeout=deadline)
+    # Don't block on stragglers; their results are simply dropped.
+    pool.shutdown(wait=False, cancel_futures=True)
+    return {futures[f]: f.result() for f in done}
+
+
+def fetch_sections(sections: dict, country=None, language="en") -> dict:
+    """Fetch several sections in parallel, one provider call per section.
+
+    Returns {bucket: items} for the sections fetched before the deadline;
+    items are None where the provider call failed.
+    """
+    return _run_with_deadline({
+        bucket: partial(fetch_from_newsdata, categories=cats, country=country, language=language)
+        for bucket, cats in sections.items()
+    })
+
+
+async def afetch_newsdata_page(categories=None, country=None, language="en", page=None):
+    """fetch_newsdata_page on the AsyncNewsdataClient."""
+    params = _build_params(categories, country, language)
+    if params is None:
+        return [], None
+    if page:
+        params["page"] = page
+
+    try:
+        data = await get_async_client().get(params)
+    except NewsdataError as exc:
+        logger.warning("Newsdata fetch failed for %s (%s/%s): %s", params.get("category"), country, language, exc)
+        return None, None
+    results = data.get("results") or []
+    return [_normalize_item(x) for x in results], data.get("nextPage") or None
+
+
+async def afetch_sections(sections: dict, country=None, language="en") -> dict:
+    """fetch_sections on the event loop: every section at once, no worker threads.
+
+    Returns {bucket: items} for the sections fetched within NEWS_FETCH_DEADLINE.
+    """
+    if not sections:
+        return {}
+    tasks = {
+        asyncio.ensure_future(afetch_newsdata_page(cats, country, language)): bucket
+        for bucket, cats in sections.items()
+    }
+    done, pending = await asyncio.wait(tasks, timeout=getattr(settings, "NEWS_FETCH_DEADLINE", 15))
+    for task in pending:
+        task.cancel()
+    return {tasks[t]: t.result()[0] for t in done}
+
+
+def _fetch_group(group: dict, country, language, quota: int, max_pages: int) -> dict:
+    """Fill several sections from shared multi-category calls, following nextPage.
+
+    Each item goes to the first section of `group` whose categories it matches
+    and that is still under `quota`. Articles are unique by URL in the DB, so an
+    item can only live in one section anyway. Never more pages than sections:
+    the group must not cost more calls than fetching them one by one.
+    """
+    categories = sorted({c for cats in group.values() for c in cats})
+    filled = {bucket: [] for bucket in group}
+    page = None
+    for _ in range(min(max_pages, len(group))):
+        items, page = fetch_newsdata_page(categories, country, language, page=page)
+        if items is None:
+            # Keep what earlier pages brought; sections left with nothing failed.
+            return {bucket: found or None for bucket, found in filled.items()}
+        for it in items:
+            tags = set(it.get("category") or [])
+            for bucket, cats in group.items():
+                if len(filled[bucket]) < quota and tags.intersection(cats):
+                    filled[bucket].append(it)
+                    break
+        if not page or all(len(v) >= quota for v in filled.values()):
+            break
+    return filled
+
+
+def fetch_sections_batched(sections: dict, country=None, language="en") -> dict:
+    """Fetch sections with up to NEWSDATA_MAX_CATEGORIES categories per provider call.
+
+    Sections are packed into groups whose combined categories fit in one call;
+    groups run in parallel under the usual deadline, and each group pages
+    until every section in it has NEWS_BATCH_QUOTA items, or it has read
+    NEWS_BATCH_MAX_PAGES pages or one page per section, whichever is fewer.
+    Pages hold NEWSDATA_PAGE_SIZE items, so that should be the plan's
+    maximum. Returns {bucket: items} like fetch_sections.
+    """
+    max_categories = getattr(settings, "NEWSDATA_MAX_CATEGORIES", 5)
+    quota = getattr(settings, "NEWS_BATCH_QUOTA", 12)
+    max_pages = getattr(settings, "NEWS_BATCH_MAX_PAGES", 5)
+
+    groups, group, group_cats = [], {}, set()
+    for bucket, cats in sections.items():
+        if group and len(group_cats | set(cats)) > max_categories:
+            groups.append(group)
+            group, group_cats = {}, set()
+        group[bucket] = cats
+        group_cats |= set(cats)
+    if group:
+        groups.append(group)
+
+    done = _run_with_deadline({
+        i: partial(_fetch_group, g, country, language, quota, max_pages) for i, g in enumerate(groups)
+    })
+    fetched = {}
+    for filled in done.values():
+        fetched.update(filled)
+    return fetched
+
+
+# ------ Storage ------
+
+# Columns refreshed when an incoming item matches an existing row; a match
+# with identical content is not written at all, so re-fetched articles don't
+# bump change_version. alt_sources is written as the stored list plus any
+# new sources, so merged sources survive.
+CONTENT_FIELDS = ["title", "summary", "image", "source", "pubDate", "category", "country", "simhash", "alt_sources"]
+UPSERT_FIELDS = CONTENT_FIELDS + ["change_version"]
+
+
+TITLE_MAX_LENGTH = NewsArticle._meta.get_field("title").max_length
+URL_MAX_LENGTH = NewsArticle._meta.get_field("url").max_length
+SOURCE_MAX_LENGTH = NewsArticle._meta.get_field("source").max_length
+
+
+def parse_pub_date(raw):
+    """Provider pubDate ("YYYY-MM-DD HH:MM:SS", UTC) -> aware datetime, or None if unusable."""
+    if not raw:
+        return None
+    if isinstance(raw, datetime):
+        value = raw
+    else:
+        try:
+            value = parse_datetime(str(raw))
+        except ValueError:
+            return None
+        if value is None:
+            return None
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value
+
+
+def _build_article(bucket: str, it: dict, country: str = ""):
+    """Turn a normalized item into an unsaved NewsArticle, or None if it has no usable key."""
+    title = (it.get("title") or "").strip()
+    url = (it.get("url") or "").strip() or None
+    if not url and not title:
+        return None
+
+    image = (it.get("image") or "").strip() or None
+    source = (it.get("source") or "").strip() or None
+
+    if url and len(url) > URL_MAX_LENGTH:
+        return None
+    if image and len(image) > URL_MAX_LENGTH:
+        image = None
+
+    return NewsArticle(
+        title=(title or "Untitled")[:TITLE_MAX_LENGTH],
+        summary=it.get("summary") or "",
+        url=url,
+        image=image,
+        source=source[:SOURCE_MAX_LENGTH] if source else None,
+        pubDate=parse_pub_date(it.get("pubDate")),
+        category=bucket,
+        country=country or "",
+    )
+
+
+def _alt_source(a: NewsArticle) -> dict:
+    return {"source": a.source, "url": a.url}
+
+
+def _collapse_near_duplicates(bucket: str, articles: list):
+    """Drop articles that are near-duplicates of a recent row or of each other.
+
+    Fingerprints every article, checks it against the bucket's recent
+    fingerprints (one query) and against the rest of the batch. Returns
+    (kept articles, {existing row id: [alt sources to attach]}); in-batch
+    duplicates are attached to the kept article directly.
+    """
+    distance = getattr(settings, "NEWS_DEDUPE_DISTANCE", 3)
+    since = timezone.localdate() - timedelta(days=getattr(settings, "NEWS_DEDUPE_WINDOW_DAYS", 3))
+
+    recent = SimHashIndex(distance)
+    rows = (
+        NewsArticle.objects
+        .filter(category=bucket, fetched_at__gte=since, simhash__isnull=False)
+        .order_by("-id")
+        .values_list("id", "url", "title", "simhash")[:getattr(settings, "NEWS_DEDUPE_RECENT", 2000)]
+    )
+    for pk, url, title, fp in rows:
+        recent.add(fp, (pk, url, title))
+
+    batch = SimHashIndex(distance)
+    kept, merges = [], defaultdict(list)
+    for a in articles:
+        a.simhash = article_fingerprint(a.title, a.summary)
+        if a.simhash is None:
+            kept.append(a)
+            continue
+
+        match = recent.find(a.simhash)
+        if match is not None:
+            pk, url, title = match
+            same_row = url == a.url if a.url else (url is None and title == a.title)
+            if not same_row:
+                merges[pk].append(_alt_source(a))
+                continue
+
+        twin = batch.find(a.simhash)
+        if twin is not None:
+            twin.alt_sources.append(_alt_source(a))
+            continue
+        batch.add(a.simhash, a)
+        kept.append(a)
+    return kept, merges
+
+
+def _unchanged(article: NewsArticle, current: tuple) -> bool:
+    return all(getattr(article, f) == v for f, v in zip(CONTENT_FIELDS, current))
+
+
+def _merge_alt_sources(stored: list, incoming: list) -> list:
+    """`stored` followed by the `incoming` sources it lacks (by URL), up to NEWS_DEDUPE_MAX_ALT_SOURCES."""
+    limit = getattr(settings, "NEWS_DEDUPE_MAX_ALT_SOURCES", 20)
+    merged = list(stored or [])
+    known = {s.get("url") for s in merged}
+    for src in incoming:
+        if len(merged) >= limit:
+            break
+        if src["url"] not in known:
+            merged.append(src)
+            known.add(src["url"])
+    return merged
+
+
+def _attach_alt_sources(merges: dict, version: int) -> None:
+    """Append merged duplicates to the alt_sources of existing rows, skipping known URLs."""
+    rows = list(NewsArticle.objects.filter(id__in=list(merges)).only("id", "alt_sources"))
+    for row in rows:
+        row.change_version = version
+        row.alt_sources = _merge_alt_sources(row.alt_sources, merges[row.id])
+    NewsArticle.objects.bulk_update(rows, ["alt_sources", "change_version"])
+
+
+def store_news_items(bucket: str, items: list, country: str = "", max_save: int = 24, publish: bool = True) -> dict:
+    """Upsert normalized items under a specific 'bucket' (our section) in one transaction.
+
+    Items with a URL go through a single INSERT ... ON CONFLICT (url) DO UPDATE;
+    items without one fall back to the (title, bucket) key. Near-duplicates of
+    recent rows (or of each other) are folded into one row's alt_sources
+    instead of being stored. Every written row gets this transaction's sync
+    version (news.sync). Returns {"inserted": n, "updated": n, "unchanged": n,
+    "skipped": n, "merged": n}. Pass max_save=None for no cap, and
+    publish=False to leave publish_buckets to the caller (e.g. once per
+    backfill run rather than per batch).
+    """
+    candidates, seen = [], set()
+    skipped = 0
+
+    for it in items:
+        if max_save is not None and len(candidates) >= max_save:
+            skipped += 1
+            continue
+        article = _build_article(bucket, it, country)
+        if article is None:
+            skipped += 1
+            continue
+        # Postgres refuses to upsert the same key twice in one statement.
+        key = ("url", article.url) if article.url else ("title", article.title)
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        candidates.append(article)
+
+    inserted = updated = merged = unchanged = 0
+    with transaction.atomic():
+        merges = {}
+        if getattr(settings, "NEWS_DEDUPE_ENABLED", True) and candidates:
+            kept, merges = _collapse_near_duplicates(bucket, candidates)
+            merged = len(candidates) - len(kept)
+            candidates = kept
+        by_url = {a.url: a for a in candidates if a.url}
+        by_title = {a.title: a for a in candidates if not a.url}
+
+        # Current content of the rows these items would overwrite.
+        existing_url = {
+            row[0]: row[1:] for row in
+            NewsArticle.objects.filter(url__in=list(by_url)).values_list("url", *CONTENT_FIELDS)
+        } if by_url else {}
+        existing_title = {
+            row[0]: row[1:] for row in
+            NewsArticle.objects
+            .filter(category=bucket, url__isnull=True, title__in=list(by_title))
+            .values_list("title", "id", *CONTENT_FIELDS)
+        } if by_title else {}
+        for batch, existing, offset in ((by_url, existing_url, 0), (by_title, existing_title, 1)):
+            for key, article in list(batch.items()):
+                # Sources folded into this article in the batch add to the row's, never replace them.
+                stored = existing[key][-1] if key in existing else []
+                article.alt_sources = _merge_alt_sources(stored, article.alt_sources)
+                if key in existing and _unchanged(article, existing[key][offset:]):
+                    del batch[key]
+                    unchanged += 1
+
+        version = next_change_version() if by_url or by_title or merges else None
+
+        if by_url:
+            for article in by_url.values():
+                article.change_version = version
+            NewsArticle.objects.bulk_create(
+                list(by_url.values()),
+                update_conflicts=True,
+                unique_fields=["url"],
+                update_fields=UPSERT_FIELDS,
+            )
+            changed = sum(1 for u in by_url if u in existing_url)
+            updated += changed
+            inserted += len(by_url) - changed
+
+        if by_title:
+            # The (title, category) key is a partial unique index, which
+            # ON CONFLICT can't target portably, so match it up front instead.
+            to_update, to_insert = [], []
+            for title, article in by_title.items():
+                article.change_version = version
+                if title in existing_title:
+                    article.pk = existing_title[title][0]
+                    to_update.append(article)
+                else:
+                    to_insert.append(article)
+            if to_update:
+                NewsArticle.objects.bulk_update(to_update, UPSERT_FIELDS)
+            if to_insert:
+                NewsArticle.objects.bulk_create(to_insert, ignore_conflicts=True)
+            updated += len(to_update)
+            inserted += len(to_insert)
+
+        if merges:
+            _attach_alt_sources(merges, version)
+
+        if inserted or updated or merged:
+            index_articles(urls=by_url, bucket=bucket, titles=by_title)
+            if publish:
+                # Cached responses for this bucket are stale once the rows are visible.
+                transaction.on_commit(lambda: publish_buckets([bucket]))
+
+    return {"inserted": inserted, "updated": updated, "unchanged": unchanged, "skipped": skipped, "merged": merged}
+
+
+# ------ Freshness ------
+
+def _fetch_log_rows(buckets, country, language):
+    return (
+        NewsFetchLog.objects
+        .filter(country=country or "", language=language or "", bucket__in=list(buckets))
+        .values_list("bucket", "fetched_at", "outcome")
+    )
+
+
+def _freshness(rows):
+    now = timezone.now()
+    ttl = timedelta(seconds=getattr(settings, "NEWS_FETCH_TTL", 3 * 60 * 60))
+    retry_ttl = timedelta(seconds=getattr(settings, "NEWS_FETCH_RETRY_TTL", 5 * 60))
+    fresh, failed = set(), set()
+    for bucket, fetched_at, outcome in rows:
+        if now - fetched_at < (ttl if outcome == NewsFetchLog.OUTCOME_OK else retry_ttl):
+            fresh.add(bucket)
+        if outcome in NewsFetchLog.FAILED_OUTCOMES:
+            failed.add(bucket)
+    return fresh, failed
+
+
+def freshness(buckets, country=None, language="en", log=None):
+    """(fresh, failed) subsets of `buckets` for this locale, in one indexed query.
+
+    fresh: not due for a refresh. A successful fetch stays fresh for
+    NEWS_FETCH_TTL seconds; an empty, timed-out or failed one only for
+    NEWS_FETCH_RETRY_TTL, so it is retried sooner (but not on every read).
+    failed: the last fetch timed out or the provider failed; serve these as
+    stale even while they are not due. `log` is the locale's (bucket,
+    fetched_at, outcome) rows if the caller already has them (see
+    news.shared), which saves the query.
+    """
+    if log is not None:
+        return _freshness(row for row in log if row[0] in buckets)
+    return _freshness(_fetch_log_rows(buckets, country, language))
+
+
+async def afreshness(buckets, country=None, language="en", log=None):
+    """freshness on the async ORM."""
+    if log is not None:
+        return _freshness(row for row in log if row[0] in buckets)
+    return _freshness([row async for row in _fetch_log_rows(buckets, country, language)])
+
+
+def fresh_buckets(buckets, country=None, language="en", log=None) -> set:
+    """The buckets not due for a refresh (see freshness)."""
+    return freshness(buckets, country, language, log)[0]
+
+
+def record_fetches(country, language, outcomes: dict) -> None:
+    """Upsert the fetch log for several buckets; `outcomes` maps bucket -> (outcome, item_count)."""
+    now = timezone.now()
+    NewsFetchLog.objects.bulk_create(
+        [
+            NewsFetchLog(
+                bucket=bucket, country=country or "", language=language or "",
+                fetched_at=now, item_count=count, outcome=outcome,
+            )
+            for bucket, (outcome, count) in outcomes.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["country", "language", "bucket"],
+        update_fields=["fetched_at", "item_count", "outcome"],
+    )
+    # Home reads take freshness from the shared snapshot, so it has to see this fetch;
+    # if the publish is skipped (lease busy), the moved generation makes readers republish.
+    transaction.on_commit(_publish_fetch_log)
+
+
+def _publish_fetch_log() -> None:
+    invalidate_buckets([FETCH_LOG])
+    publish_shared_snapshot()
+
+
+# ------ Refresh ------
+
+# refresh_sections outcomes besides the NewsFetchLog ones.
+OUTCOME_BUSY = "busy"
+OUTCOME_FRESH = "fresh"
+OUTCOME_CIRCUIT_OPEN = "circuit_open"
+
+
+def _lease_name(bucket: str, country, language) -> str:
+    return f"refresh:{bucket}:{country or ''}:{language or ''}"
+
+
+def _claim_sections(sections: dict, country, language, force: bool):
+    """Take the refresh leases; returns (leases, sections still to fetch, results so far)."""
+    leases = {}
+    for bucket in sections:
+        token = acquire_lease(_lease_name(bucket, country, language))
+        if token:
+            leases[bucket] = token
+    results = {b: (OUTCOME_BUSY, None) for b in sections if b not in leases}
+
+    todo = {b: sections[b] for b in leases}
+    if not force and todo:
+        # Someone may have finished this refresh just before we got the lease.
+        for bucket in fresh_buckets(todo, country=country, language=language):
+            results[bucket] = (OUTCOME_FRESH, None)
+            del todo[bucket]
+    return leases, todo, results
+
+
+def _store_fetched(todo: dict, fetched: dict, country, language, results: dict) -> None:
+    """Store what came back for `todo`, log every bucket's outcome and fill in `results`."""
+    outcomes = {}
+    for bucket in todo:
+        items = fetched.get(bucket)
+        if bucket not in fetched:
+            outcomes[bucket] = (NewsFetchLog.OUTCOME_TIMEOUT, 0)
+            results[bucket] = (NewsFetchLog.OUTCOME_TIMEOUT, None)
+        elif items is None:
+            outcomes[bucket] = (NewsFetchLog.OUTCOME_ERROR, 0)
+            results[bucket] = (NewsFetchLog.OUTCOME_ERROR, None)
+        elif not items:
+            outcomes[bucket] = (NewsFetchLog.OUTCOME_EMPTY, 0)
+            results[bucket] = (NewsFetchLog.OUTCOME_EMPTY, None)
+        else:
+            stats = store_news_items(bucket=bucket, items=items, country=country or "")
+            outcomes[bucket] = (NewsFetchLog.OUTCOME_OK, len(items))
+            results[bucket] = (NewsFetchLog.OUTCOME_OK, stats)
+    if outcomes:
+        record_fetches(country, language, outcomes)
+
+
+def _release_leases(leases: dict, country, language) -> None:
+    for bucket, token in leases.items():
+        release_lease(_lease_name(bucket, country, language), token)
+
+
+def refresh_sections(sections: dict, country=None, language="en", force=False, batched=None) -> dict:
+    """Fetch the given sections in parallel and store whatever came back.
+
+    With `batched` (default: NEWS_INGEST_BATCHED) sections share
+    multi-category provider calls, see fetch_sections_batched.
+
+    Each (bucket, country, language) is refreshed by one process at a time:
+    buckets whose lease is held elsewhere are skipped ("busy"), and buckets
+    that turned fresh while we waited for the lease are skipped ("fresh")
+    unless `force` is set. While the provider's circuit breaker is open
+    nothing is attempted ("circuit_open"). Returns
+    {bucket: (outcome, store stats or None)}.
+    """
+    if get_breaker().is_open():
+        return {b: (OUTCOME_CIRCUIT_OPEN, None) for b in sections}
+
+    leases, todo, results = _claim_sections(sections, country, language, force)
+    try:
+        if batched is None:
+            batched = getattr(settings, "NEWS_INGEST_BATCHED", False)
+        fetch = fetch_sections_batched if batched else fetch_sections
+        fetched = fetch(todo, country=country, language=language)
+        _store_fetched(todo, fetched, country, language, results)
+    finally:
+        _release_leases(leases, country, language)
+
+    return results
+
+
+async def arefresh_sections(sections: dict, country=None, language="en", force=False) -> dict:
+    """refresh_sections for the event loop.
+
+    Provider calls go out concurrently on the AsyncNewsdataClient (one per
+    section; batching is a sync-path feature); the DB work runs in a thread
+    through sync_to_async. Same leases, outcomes and return value.
+    """
+    # The breaker and the leases live in the cache (Redis in production): keep those calls off the loop.
+    if await sync_to_async(get_breaker().is_open)():
+        return {b: (OUTCOME_CIRCUIT_OPEN, None) for b in sections}
+
+    leases, todo, results = await sync_to_async(_claim_sections)(sections, country, language, force)
+    try:
+        fetched = await afetch_sections(todo, country=country, language=language)
+        await sync_to_async(_store_fetched)(todo, fetched, country, language, results)
+    finally:
+        await sync_to_async(_release_leases)(leases, country, language)
+
+    return results
+
+
+_refresh_pool = None
+_refresh_pool_lock = threading.Lock()
+_inflight = set()
+
+
+def _get_refresh_pool() -> ThreadPoolExecutor:
+    global _refresh_pool
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            # One refresh at a time per process; each refresh fans out on its own.
+            _refresh_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="news-refresh")
+        return _refresh_pool
+
+
+def _run_refresh(sections: dict, country, language) -> None:
+    try:
+        refresh_sections(sections, country=country, language=language)
+    except Exception:
+        logger.exception("Background refresh failed for %s (%s/%s)", sorted(sections), country, language)
+    finally:
+        with _refresh_pool_lock:
+            _inflight.difference_update((b, country, language) for b in sections)
+        # This thread owns its own DB connection; don't leak it.
+        connections.close_all()
+
+
+def _claim_inflight(sections: dict, country, language) -> dict:
+    """The sections not already being refreshed for this locale in this process, now marked in flight."""
+    with _refresh_pool_lock:
+        pending = {b: cats for b, cats in sections.items() if (b, country, language) not in _inflight}
+        _inflight.update((b, country, language) for b in pending)
+    return pending
+
+
+def ingest_locales() -> set:
+    """The (country, language) pairs in NEWS_INGEST_LOCALES ("us:en,in:en")."""
+    locales = set()
+    for value in getattr(settings, "NEWS_INGEST_LOCALES", ["us:en"]):
+        country, sep, language = value.partition(":")
+        if sep:
+            locales.add((country.strip().lower(), language.strip().lower()))
+    return locales
+
+
+def _may_refresh_on_read(country, language) -> bool:
+    # Reads only revalidate locales we ingest; anything else would spend provider quota on request input.
+    if not getattr(settings, "NEWS_REVALIDATE_ON_READ", True):
+        return False
+    return (country or "", language or "") in ingest_locales()
+
+
+def schedule_refresh(sections: dict, country=None, language="en") -> bool:
+    """Queue a background refresh of stale sections without blocking the caller.
+
+    Sections already queued for the same locale in this process are skipped,
+    as are locales outside NEWS_INGEST_LOCALES. Returns True if anything was
+    queued.
+    """
+    if not _may_refresh_on_read(country, language) or get_breaker().is_open():
+        return False
+
+    pending = _claim_inflight(sections, country, language)
+    if not pending:
+        return False
+
+    _get_refresh_pool().submit(_run_refresh, pending, country, language)
+    return True
+
+
+# Strong references to running refresh tasks; the loop only keeps weak ones.
+_background_tasks = set()
+
+
+async def _arun_refresh(sections: dict, country, language) -> None:
+    try:
+        await arefresh_sections(sections, country=country, language=language)
+    except Exception:
+        logger.exception("Background refresh failed for %s (%s/%s)", sorted(sections), country, language)
+    finally:
+        with _refresh_pool_lock:
+            _inflight.difference_update((b, country, language) for b in sections)
+
+
+def aschedule_refresh(sections: dict, country=None, language="en") -> bool:
+    """schedule_refresh for a long-lived event loop (ASGI): the refresh runs as a task on it.
+
+    Only call this where the loop outlives the request; under WSGI each async
+    view gets a throwaway loop, so use schedule_refresh there. The breaker
+    is checked by the task (arefresh_sections), not here on the loop.
+    """
+    if not _may_refresh_on_read(country, language):
+        return False
+
+    pending = _claim_inflight(sections, country, language)
+    if not pending:
+        return False
+
+    task = asyncio.get_running_loop().create_task(_arun_refresh(pending, country, language))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return True
+
@@ -0,0 +1,148 @@
+"""Live push of new articles over Server-Sent Events (ASGI only).
+
+One BroadcastHub per worker process. While anyone is subscribed, it runs a
+single watcher task that polls for rows past the highest article id it has
+seen (a primary-key range scan that almost always returns nothing), encodes
+each bucket's new rows once, and hands the same frame to every subscriber's
+queue. The DB work is one query per NEWS_LIVE_POLL seconds per process,
+however many clients are connected.
+
+Polling the table rather than the bucket generations keeps this correct when
+ingestion runs in another process without a shared cache. Only new rows are
+pushed; updates of existing articles are not.
+
+A slow client's queue drops its oldest frames instead of holding up the hub.
+Streams end after NEWS_LIVE_MAX_AGE seconds; EventSource reconnects on its
+own, sending Last-Event-ID, and catch_up() replays what it missed. A client
+that missed more than NEWS_LIVE_MAX_CATCH_UP rows gets a "reset" event
+instead, and should reload the feed.
+"""
+import asyncio
+import logging
+
+from django.conf import settings
+
+from backend.renderers import dumps
+
+from .models import NewsArticle
+from .queries import ARTICLE_COLUMNS, CATEGORY, ID, serialize_row
+
+logger = logging.getLogger(__name__)
+
+
+def sse_frame(event: str, data: bytes, event_id=None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + data + b"\n\n"
+
+
+def _article_frames(rows) -> list:
+    """[(bucket, last id, frame)] for `rows` (ARTICLE_COLUMNS tuples in id order), one frame per bucket."""
+    by_bucket = {}
+    for row in rows:
+        by_bucket.setdefault(row[CATEGORY], []).append(row)
+    return [
+        (bucket, bucket_rows[-1][ID], sse_frame(
+            "articles",
+            dumps({"bucket": bucket, "items": [serialize_row(r) for r in bucket_rows]}),
+            event_id=bucket_rows[-1][ID],
+        ))
+        for bucket, bucket_rows in by_bucket.items()
+    ]
+
+
+def _new_rows(after_id: int, buckets=None, limit=None):
+    qs = NewsArticle.objects.filter(id__gt=after_id)
+    if buckets:
+        qs = qs.filter(category__in=list(buckets))
+    return qs.order_by("id").values_list(*ARTICLE_COLUMNS)[:limit or getattr(settings, "NEWS_LIVE_MAX_BATCH", 200)]
+
+
+async def catch_up(after_id: int, buckets=None):
+    """[(bucket, last id, frame)] for every row a reconnecting client missed since `after_id`.
+
+    Reads NEWS_LIVE_MAX_BATCH rows at a time up to the newest one. Returns
+    None if more than NEWS_LIVE_MAX_CATCH_UP were missed: replaying that
+    much is slower than the client reloading the feed.
+    """
+    batch = getattr(settings, "NEWS_LIVE_MAX_BATCH", 200)
+    budget = getattr(settings, "NEWS_LIVE_MAX_CATCH_UP", 1000)
+    rows = []
+    while True:
+        page = [row async for row in _new_rows(after_id, buckets, limit=min(batch, budget - len(rows) + 1))]
+        rows += page
+        if len(rows) > budget:
+            return None
+        if len(page) < batch:
+            return _article_frames(rows)
+        after_id = page[-1][ID]
+
+
+class Subscription:
+    def __init__(self, buckets=None, size=100):
+        self.buckets = set(buckets) if buckets else None
+        self.queue = asyncio.Queue(maxsize=size)
+
+    def offer(self, bucket: str, event_id: int, frame: bytes) -> None:
+        if self.buckets is not None and bucket not in self.buckets:
+            return
+        if self.queue.full():
+            # Slow reader: lose the oldest frame rather than block everyone else.
+            self.queue.get_nowait()
+        self.queue.put_nowait((event_id, frame))
+
+
+class BroadcastHub:
+    """Fans new-article frames out to every subscription on this event loop."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._watcher = None
+        self._last_id = None
+
+    def subscribe(self, buckets=None) -> Subscription:
+        sub = Subscription(buckets, size=getattr(settings, "NEWS_LIVE_QUEUE", 100))
+        self._subscriptions.add(sub)
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.get_running_loop().create_task(self._watch())
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscriptions.discard(sub)
+
+    def publish(self, frames) -> None:
+        for bucket, event_id, frame in frames:
+            for sub in list(self._subscriptions):
+                sub.offer(bucket, event_id, frame)
+
+    async def _watch(self) -> None:
+        poll = getattr(settings, "NEWS_LIVE_POLL", 2)
+        if self._last_id is None:
+            latest = await NewsArticle.objects.order_by("-id").values_list("id", flat=True).afirst()
+            self._last_id = latest or 0
+        # Exits with the last subscriber; the next subscribe() starts a new one.
+        while self._subscriptions:
+            await asyncio.sleep(poll)
+            try:
+                rows = [row async for row in _new_rows(self._last_id)]
+            except Exception:
+                logger.exception("Live news poll failed")
+                continue
+            if rows:
+                self._last_id = rows[-1][ID]
+                self.publish(_article_frames(rows))
+        # Rows written while nobody listened are not news to the next subscriber.
+        self._last_id = None
+
+
+_hubs = {}
+
+
+def get_hub() -> BroadcastHub:
+    """The hub for the running event loop (one per ASGI worker process)."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        for other in [l for l in _hubs if l.is_closed()]:
+            del _hubs[other]
+        hub = _hubs[loop] = BroadcastHub()
+    return hub
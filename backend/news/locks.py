@@ -0,0 +1,54 @@
+"""Cross-process single-flight leases on top of the shared cache.
+
+cache.add() only succeeds for the first caller, so whoever adds the lease key
+owns the work; everyone else backs off and serves what is already stored. The
+lease expires on its own if its owner dies mid-refresh. With the per-process
+LocMemCache this only dedupes within one process; configure REDIS_URL to
+share leases between workers.
+
+On Redis a lease is released with an atomic compare-and-delete. Other
+backends have no such primitive: release is get-then-delete, and a lease
+that expires between the two can have its successor's key deleted. Keep
+NEWS_REFRESH_LEASE well above the longest refresh so that never happens.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+
+LEASE_PREFIX = "news:lease:"
+
+
+def acquire_lease(name: str, ttl=None):
+    """Try to take the lease `name`; returns an owner token, or None if someone else holds it."""
+    token = uuid.uuid4().hex
+    ttl = ttl or getattr(settings, "NEWS_REFRESH_LEASE", 60)
+    if cache.add(f"{LEASE_PREFIX}{name}", token, ttl):
+        return token
+    return None
+
+
+# Delete KEYS[1] only while it still holds our (serialized) token.
+COMPARE_AND_DELETE = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def release_lease(name: str, token: str) -> None:
+    """Give the lease back, unless it already expired and was taken over."""
+    key = f"{LEASE_PREFIX}{name}"
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, RedisCache):
+        redis_key = backend.make_and_validate_key(key)
+        client = backend._cache
+        client.get_client(redis_key, write=True).eval(
+            COMPARE_AND_DELETE, 1, redis_key, client._serializer.dumps(token)
+        )
+        return
+    # Not atomic: see the module docstring for why the lease TTL covers it.
+    if cache.get(key) == token:
+        cache.delete(key)
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from news.backfill import NEWSDATA_ARCHIVE_URL, run_backfill
+from news.client import NEWSDATA_URL, NewsdataError
+from news.ingestion import SECTIONS
+from news.models import NewsBackfillCheckpoint
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream every page Newsdata has for a section/locale into the DB, in batches, "
+        "checkpointing the cursor so an interrupted run resumes where it stopped. "
+        "With --from-date/--to-date it reads the archive endpoint instead of /news."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bucket", action="append", dest="buckets", choices=sorted(SECTIONS),
+            help="Section to backfill (repeatable). Defaults to all sections.",
+        )
+        parser.add_argument(
+            "--locale", metavar="COUNTRY:LANGUAGE",
+            help="Locale to backfill, e.g. us:en. Defaults to the first of NEWS_INGEST_LOCALES.",
+        )
+        parser.add_argument("--from-date", help="Archive start date, YYYY-MM-DD.")
+        parser.add_argument("--to-date", help="Archive end date, YYYY-MM-DD.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Articles per DB write (whole pages).")
+        parser.add_argument("--max-pages", type=int, help="Stop after this many pages per section in this run.")
+        parser.add_argument("--reset", action="store_true", help="Ignore any saved checkpoint and start over.")
+
+    def handle(self, *args, **options):
+        locale = options["locale"] or getattr(settings, "NEWS_INGEST_LOCALES", ["us:en"])[0]
+        country, sep, language = locale.partition(":")
+        if not sep or not country or not language:
+            raise CommandError(f"Bad locale {locale!r}; expected COUNTRY:LANGUAGE, e.g. us:en")
+
+        url, extra_params, query = NEWSDATA_URL, {}, "news"
+        if options["from_date"] or options["to_date"]:
+            url, query = NEWSDATA_ARCHIVE_URL, f"archive:{options['from_date'] or ''}..{options['to_date'] or ''}"
+            if options["from_date"]:
+                extra_params["from_date"] = options["from_date"]
+            if options["to_date"]:
+                extra_params["to_date"] = options["to_date"]
+
+        for bucket in options["buckets"] or SECTIONS:
+            checkpoint, _ = NewsBackfillCheckpoint.objects.get_or_create(
+                bucket=bucket, country=country, language=language,
+            )
+            label = f"[{country}:{language}] {bucket}"
+            if options["reset"] or checkpoint.query != query:
+                if checkpoint.next_page and not options["reset"]:
+                    raise CommandError(
+                        f"{label}: saved cursor belongs to {checkpoint.query!r}, not {query!r}; use --reset"
+                    )
+                checkpoint.query, checkpoint.next_page = query, None
+                checkpoint.pages = checkpoint.items = 0
+                checkpoint.finished = False
+                checkpoint.save()
+            elif checkpoint.finished:
+                self.stdout.write(f"{label}: already complete (use --reset to run again)")
+                continue
+
+            try:
+                for stats in run_backfill(
+                    bucket, SECTIONS[bucket], country, language, checkpoint,
+                    batch_size=options["batch_size"], max_pages=options["max_pages"],
+                    url=url, extra_params=extra_params,
+                ):
+                    self.stdout.write(
+                        f"{label}: page {checkpoint.pages}, +{stats['inserted']} new, "
+                        f"{stats['updated']} updated, {stats['unchanged']} unchanged, {stats['skipped']} skipped ({checkpoint.items} total)"
+                    )
+            except NewsdataError as exc:
+                raise CommandError(f"{label}: provider error at page {checkpoint.pages + 1}: {exc}. Re-run to resume.")
+
+            state = "complete" if checkpoint.finished else "paused"
+            self.stdout.write(self.style.SUCCESS(f"{label}: {state}, {checkpoint.items} articles over {checkpoint.pages} pages"))
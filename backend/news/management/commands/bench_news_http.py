@@ -0,0 +1,64 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test news endpoints over HTTP with many concurrent connections and report "
+        "throughput and latency, to compare the WSGI and ASGI deployments. For example, "
+        "start `gunicorn backend.wsgi -w 4 -b :8000` and `uvicorn backend.asgi:application "
+        "--workers 4 --port 8001`, then run with --url http://127.0.0.1:8000/api/news/home/ "
+        "--url http://127.0.0.1:8001/api/news/async/home/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", action="append", dest="urls", required=True, help="Endpoint to hit (repeatable).")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per URL.")
+        parser.add_argument("--concurrency", type=int, default=200, help="Requests in flight at once.")
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--requests and --concurrency must be positive")
+        for url in options["urls"]:
+            stats = asyncio.run(self._run(url, options["requests"], options["concurrency"], options["timeout"]))
+            self.stdout.write(
+                f"{url}\n  {stats['ok']}/{options['requests']} ok, {stats['rps']:.0f} req/s, "
+                f"p50 {stats['p50']:.1f} ms, p99 {stats['p99']:.1f} ms, max {stats['max']:.1f} ms"
+            )
+
+    async def _run(self, url, total, concurrency, timeout):
+        latencies, ok = [], 0
+        queue = iter(range(total))
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+            async def worker():
+                nonlocal ok
+                for _ in queue:
+                    started = time.perf_counter()
+                    try:
+                        resp = await client.get(url)
+                    except httpx.HTTPError:
+                        continue
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    ok += resp.status_code == 200
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+            elapsed = time.perf_counter() - started
+
+        if not latencies:
+            raise CommandError(f"{url}: every request failed")
+        latencies.sort()
+        return {
+            "ok": ok,
+            "rps": len(latencies) / elapsed,
+            "p50": statistics.median(latencies),
+            "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+            "max": latencies[-1],
+        }
@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer
+from news.models import NewsArticle
+from news.queries import ARTICLE_COLUMNS, serialize_row
+
+
+def _legacy_serialize(a: NewsArticle) -> dict:
+    # The per-instance serializer the read path used before tuples + orjson.
+    return {
+        "title": a.title,
+        "summary": a.summary,
+        "url": a.url,
+        "image": a.image,
+        "source": a.source,
+        "pubDate": a.pubDate.isoformat() if a.pubDate else None,
+        "category": [a.category] if a.category else [],
+        "country": [a.country] if a.country else [],
+        "alt_sources": a.alt_sources or [],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark the CPU cost of rendering a home payload (sections x items): model "
+        "instances + DRF JSONRenderer versus value tuples + ORJSONRenderer. SQL time is "
+        "excluded; both paths start from the same database rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sections", type=int, default=8)
+        parser.add_argument("--items", type=int, default=12)
+        parser.add_argument("--iterations", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        fields = [f.attname for f in NewsArticle._meta.concrete_fields]
+        db_rows = {}
+        for s in range(options["sections"]):
+            bucket = f"section{s}"
+            db_rows[bucket] = [
+                {
+                    "id": s * 1000 + i,
+                    "title": f"Headline {i} for {bucket}: officials announce a new policy on the economy",
+                    "summary": "A summary paragraph of roughly the length the provider sends. " * 4,
+                    "url": f"https://example.com/{bucket}/{i}",
+                    "image": f"https://cdn.example.com/{bucket}/{i}.jpg",
+                    "source": "example",
+                    "pubDate": now - timedelta(minutes=i),
+                    "category": bucket,
+                    "country": "us",
+                    "fetched_at": now.date(),
+                    "simhash": 0,
+                    "alt_sources": [],
+                }
+                for i in range(options["items"])
+            ]
+        full_rows = {b: [tuple(r[f] for f in fields) for r in rows] for b, rows in db_rows.items()}
+        lean_rows = {b: [tuple(r[c] for c in ARTICLE_COLUMNS) for r in rows] for b, rows in db_rows.items()}
+
+        json_renderer, orjson_renderer = JSONRenderer(), ORJSONRenderer()
+
+        def legacy():
+            payload = {
+                b: [_legacy_serialize(NewsArticle.from_db("default", fields, row)) for row in rows]
+                for b, rows in full_rows.items()
+            }
+            return json_renderer.render(payload)
+
+        def lean():
+            payload = {b: [serialize_row(row) for row in rows] for b, rows in lean_rows.items()}
+            return orjson_renderer.render(payload)
+
+        results = {}
+        for name, render in (("instances + JSONRenderer", legacy), ("tuples + ORJSONRenderer", lean)):
+            render()  # warm up
+            started = time.process_time()
+            for _ in range(options["iterations"]):
+                size = len(render())
+            results[name] = (time.process_time() - started) / options["iterations"] * 1e6
+            self.stdout.write(f"{name:<26} {results[name]:8.1f} us/request  ({size} bytes)")
+
+        before, after = results.values()
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['sections']}x{options['items']} payload: {before - after:.1f} us CPU saved "
+            f"per request ({before / after:.1f}x faster)"
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from news.ingestion import SECTIONS
+from news.snapshots import publish_buckets
+
+
+class Command(BaseCommand):
+    help = "Rebuild the pre-encoded JSON snapshots of every section (ingestion normally keeps them current)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bucket", action="append", dest="buckets", choices=sorted(SECTIONS),
+            help="Section to rebuild (repeatable). Defaults to all sections.",
+        )
+
+    def handle(self, *args, **options):
+        buckets = options["buckets"] or list(SECTIONS)
+        publish_buckets(buckets)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(buckets)} snapshot(s)"))
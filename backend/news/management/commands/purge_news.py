@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from news.ingestion import SECTIONS
+from news.retention import purge_bucket, retention_policy
+from news.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete articles past their bucket's retention policy (NEWS_RETENTION), "
+        "in small primary-key ranged chunks so no long locks are taken, then prune "
+        "sync tombstones older than NEWS_SYNC_TOMBSTONE_DAYS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bucket", action="append", dest="buckets", choices=sorted(SECTIONS),
+            help="Section to purge (repeatable). Defaults to all sections.",
+        )
+        parser.add_argument("--chunk-size", type=int, help="Primary keys per delete. Defaults to NEWS_PURGE_CHUNK.")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between chunks.")
+        parser.add_argument("--dry-run", action="store_true", help="Count what would be deleted, delete nothing.")
+
+    def handle(self, *args, **options):
+        verb = "would delete" if options["dry_run"] else "deleted"
+        for bucket in options["buckets"] or SECTIONS:
+            policy = retention_policy(bucket)
+            total = 0
+            for total in purge_bucket(
+                bucket, policy, chunk_size=options["chunk_size"],
+                pause=options["pause"], dry_run=options["dry_run"],
+            ):
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{bucket}: {total} so far")
+            self.stdout.write(self.style.SUCCESS(
+                f"{bucket}: {verb} {total} (max_age_days={policy.get('max_age_days')}, "
+                f"max_rows={policy.get('max_rows')})"
+            ))
+        if not options["dry_run"]:
+            self.stdout.write(f"Pruned {prune_tombstones()} sync tombstone(s)")
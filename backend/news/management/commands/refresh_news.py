@@ -0,0 +1,90 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from news.config import get_news_config
+from news.ingestion import OUTCOME_BUSY, OUTCOME_CIRCUIT_OPEN, OUTCOME_FRESH, SECTIONS, fresh_buckets, refresh_sections
+from news.models import NewsFetchLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh news sections from Newsdata for every configured (country, language). "
+        "Run once from cron, or with --loop as a long-running worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--locale", action="append", dest="locales", metavar="COUNTRY:LANGUAGE",
+            help="Locale to refresh, e.g. us:en (repeatable). Defaults to NEWS_INGEST_LOCALES.",
+        )
+        parser.add_argument(
+            "--bucket", action="append", dest="buckets", choices=sorted(SECTIONS),
+            help="Only refresh this section (repeatable). Defaults to all sections.",
+        )
+        parser.add_argument("--force", action="store_true", help="Refresh even if the section is fresh.")
+        parser.add_argument(
+            "--batched", action="store_true", default=None,
+            help="Fetch several sections per provider call (default: NEWS_INGEST_BATCHED).",
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep running, one cycle every --interval seconds.")
+        parser.add_argument(
+            "--interval", type=int, default=getattr(settings, "NEWS_INGEST_INTERVAL", 900),
+            help="Seconds between cycles with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        locales = [self._parse_locale(l) for l in options["locales"] or getattr(settings, "NEWS_INGEST_LOCALES", ["us:en"])]
+        sections = {b: SECTIONS[b] for b in options["buckets"] or SECTIONS}
+
+        while True:
+            started = time.monotonic()
+            self._cycle(locales, sections, force=options["force"], batched=options["batched"])
+            if not options["loop"]:
+                break
+            # Long-lived process: drop connections the DB may have timed out.
+            close_old_connections()
+            time.sleep(max(0, options["interval"] - (time.monotonic() - started)))
+
+    def _cycle(self, locales, sections, force=False, batched=None):
+        config = get_news_config()
+        if not config.fetch_enabled:
+            self.stdout.write("Fetching is disabled in News Config; skipping.")
+            return
+
+        for country, language in locales:
+            stale = sections
+            if not force:
+                fresh = fresh_buckets(sections, country=country, language=language)
+                stale = {b: cats for b, cats in sections.items() if b not in fresh}
+            if not stale:
+                self.stdout.write(f"[{country}:{language}] all sections fresh")
+                continue
+
+            results = refresh_sections(stale, country=country, language=language, force=force, batched=batched)
+            for bucket, (outcome, stats) in results.items():
+                label = f"[{country}:{language}] {bucket}"
+                if outcome == NewsFetchLog.OUTCOME_OK:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{label}: {stats['inserted']} new, {stats['updated']} updated, {stats['unchanged']} unchanged, {stats['skipped']} skipped"
+                    ))
+                elif outcome == NewsFetchLog.OUTCOME_TIMEOUT:
+                    self.stdout.write(self.style.WARNING(f"{label}: missed the deadline"))
+                elif outcome == NewsFetchLog.OUTCOME_ERROR:
+                    self.stdout.write(self.style.WARNING(f"{label}: provider call failed"))
+                elif outcome == OUTCOME_BUSY:
+                    self.stdout.write(f"{label}: being refreshed by another worker")
+                elif outcome == OUTCOME_FRESH:
+                    self.stdout.write(f"{label}: already fresh")
+                elif outcome == OUTCOME_CIRCUIT_OPEN:
+                    self.stdout.write(self.style.WARNING(f"{label}: provider circuit open, skipped"))
+                else:
+                    self.stdout.write(f"{label}: no items")
+
+    def _parse_locale(self, value):
+        country, sep, language = value.partition(":")
+        if not sep or not country or not language:
+            raise CommandError(f"Bad locale {value!r}; expected COUNTRY:LANGUAGE, e.g. us:en")
+        return country.strip(), language.strip()
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def dedupe_articles(apps, schema_editor):
+    """Collapse duplicate rows so the new unique keys can be created; the newest row wins."""
+    NewsArticle = apps.get_model("news", "NewsArticle")
+    NewsArticle.objects.filter(url="").update(url=None)
+
+    seen = set()
+    doomed = []
+    rows = NewsArticle.objects.order_by("-id").values_list("id", "url", "title", "category")
+    for pk, url, title, category in rows.iterator():
+        key = ("url", url) if url else ("title", title, category)
+        if key in seen:
+            doomed.append(pk)
+        else:
+            seen.add(key)
+
+    for i in range(0, len(doomed), 500):
+        NewsArticle.objects.filter(id__in=doomed[i:i + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_alter_newsconfig_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_articles, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='newsarticle',
+            name='url',
+            field=models.URLField(blank=True, max_length=500, null=True, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name='newsarticle',
+            constraint=models.UniqueConstraint(condition=models.Q(('url__isnull', True)), fields=('title', 'category'), name='news_article_title_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.24 on 2026-10-17 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_newsarticle_unique_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['category', '-pubDate', '-id'], name='news_cat_pubdate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['category', 'fetched_at'], name='news_cat_fetched_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.24 on 2026-10-17 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_newsarticle_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsFetchLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=50)),
+                ('country', models.CharField(blank=True, default='', max_length=50)),
+                ('language', models.CharField(blank=True, default='', max_length=10)),
+                ('fetched_at', models.DateTimeField()),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('outcome', models.CharField(choices=[('ok', 'OK'), ('empty', 'No items'), ('timeout', 'Timed out')], default='ok', max_length=10)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='newsfetchlog',
+            constraint=models.UniqueConstraint(fields=('country', 'language', 'bucket'), name='news_fetchlog_locale_uniq'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.24 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_newsfetchlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsBackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=50)),
+                ('country', models.CharField(blank=True, default='', max_length=50)),
+                ('language', models.CharField(blank=True, default='', max_length=10)),
+                ('query', models.CharField(blank=True, default='', max_length=100)),
+                ('next_page', models.CharField(blank=True, max_length=255, null=True)),
+                ('pages', models.PositiveIntegerField(default=0)),
+                ('items', models.PositiveIntegerField(default=0)),
+                ('finished', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='newsbackfillcheckpoint',
+            constraint=models.UniqueConstraint(fields=('country', 'language', 'bucket'), name='news_backfill_locale_uniq'),
+        ),
+    ]
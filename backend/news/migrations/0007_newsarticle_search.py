@@ -0,0 +1,51 @@
+from django.db import migrations
+
+PG_FORWARD = [
+    """
+    ALTER TABLE news_newsarticle ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX news_article_search_gin ON news_newsarticle USING gin (search_vector)",
+]
+PG_REVERSE = [
+    "DROP INDEX IF EXISTS news_article_search_gin",
+    "ALTER TABLE news_newsarticle DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE news_article_fts USING fts5(title, summary)",
+    "INSERT INTO news_article_fts (rowid, title, summary) "
+    "SELECT id, title, COALESCE(summary, '') FROM news_newsarticle",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS news_article_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+    """Full-text search: a generated tsvector + GIN index on PostgreSQL, FTS5 on SQLite.
+
+    The column/table live outside the Django model on purpose; news.search
+    queries them with raw SQL.
+    """
+
+    dependencies = [
+        ('news', '0006_newsbackfillcheckpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": PG_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": PG_REVERSE, "sqlite": SQLITE_REVERSE}),
+        ),
+    ]
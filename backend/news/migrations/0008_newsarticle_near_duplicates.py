@@ -0,0 +1,23 @@
+# Generated by Django 4.2.24 on 2026-10-17 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_newsarticle_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='alt_sources',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='newsarticle',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.24 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_newsarticle_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsSectionSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=50, unique=True)),
+                ('home_json', models.TextField(default='[]')),
+                ('page_json', models.TextField(default='[]')),
+                ('next_cursor', models.CharField(blank=True, max_length=100, null=True)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.24 on 2026-10-17 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newsfetchlog',
+            name='outcome',
+            field=models.CharField(choices=[('ok', 'OK'), ('empty', 'No items'), ('timeout', 'Timed out'), ('error', 'Provider error')], default='ok', max_length=10),
+        ),
+    ]
@@ -3,17 +3,141 @@ from django.db import models
 class NewsArticle(models.Model):
     title = models.CharField(max_length=500)
     summary = models.TextField(blank=True, null=True)
-    url = models.URLField(max_length=500, blank=True, null=True)
+    url = models.URLField(max_length=500, blank=True, null=True, unique=True)
     image = models.URLField(max_length=500, blank=True, null=True)
     source = models.CharField(max_length=100, blank=True, null=True)
     pubDate = models.DateTimeField(blank=True, null=True)
     category = models.CharField(max_length=50, blank=True, null=True)
     country = models.CharField(max_length=50, blank=True, null=True)
     fetched_at = models.DateField(auto_now_add=True)
+    # SimHash of title + summary (news.dedupe), and the other outlets that ran
+    # the same story: [{"source": ..., "url": ...}, ...].
+    simhash = models.BigIntegerField(blank=True, null=True)
+    alt_sources = models.JSONField(default=list, blank=True)
+    # Sync version of the last insert/update (news.sync); rows from before it existed stay at 0.
+    change_version = models.BigIntegerField(default=0)
 
     def __str__(self):
         return self.title[:50]
 
+    class Meta:
+        indexes = [
+            # get_db_sections, get_db_section_page, snapshots: WHERE category = ? ORDER BY pubDate DESC, id DESC
+            models.Index(fields=["category", "-pubDate", "-id"], name="news_cat_pubdate_idx"),
+            # freshness checks: WHERE category = ? AND fetched_at = ?
+            models.Index(fields=["category", "fetched_at"], name="news_cat_fetched_idx"),
+            # delta sync: WHERE (change_version, id) > (?, ?) ORDER BY change_version, id
+            models.Index(fields=["change_version", "id"], name="news_change_version_idx"),
+        ]
+        constraints = [
+            # Fallback upsert key for items the provider sends without a link.
+            models.UniqueConstraint(
+                fields=["title", "category"],
+                condition=models.Q(url__isnull=True),
+                name="news_article_title_bucket_uniq",
+            ),
+        ]
+
+
+class NewsFetchLog(models.Model):
+    """Last refresh of one section for one (country, language); drives freshness."""
+
+    OUTCOME_OK = "ok"
+    OUTCOME_EMPTY = "empty"
+    OUTCOME_TIMEOUT = "timeout"
+    OUTCOME_ERROR = "error"
+    OUTCOME_CHOICES = [
+        (OUTCOME_OK, "OK"),
+        (OUTCOME_EMPTY, "No items"),
+        (OUTCOME_TIMEOUT, "Timed out"),
+        (OUTCOME_ERROR, "Provider error"),
+    ]
+    # The section is served stale after these, however recent.
+    FAILED_OUTCOMES = (OUTCOME_TIMEOUT, OUTCOME_ERROR)
+
+    bucket = models.CharField(max_length=50)
+    country = models.CharField(max_length=50, blank=True, default="")
+    language = models.CharField(max_length=10, blank=True, default="")
+    fetched_at = models.DateTimeField()
+    item_count = models.PositiveIntegerField(default=0)
+    outcome = models.CharField(max_length=10, choices=OUTCOME_CHOICES, default=OUTCOME_OK)
+
+    def __str__(self):
+        return f"{self.bucket} [{self.country}:{self.language}] {self.outcome} @ {self.fetched_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        constraints = [
+            # Leading (country, language) so one locale's buckets are a single range scan.
+            models.UniqueConstraint(fields=["country", "language", "bucket"], name="news_fetchlog_locale_uniq"),
+        ]
+
+
+class NewsSectionSnapshot(models.Model):
+    """A bucket's newest items, already encoded as JSON, rebuilt by ingestion (news.snapshots)."""
+
+    bucket = models.CharField(max_length=50, unique=True)
+    # JSON arrays of serialized articles: the home page's slice and the first category page.
+    home_json = models.TextField(default="[]")
+    page_json = models.TextField(default="[]")
+    next_cursor = models.CharField(max_length=100, blank=True, null=True)
+    item_count = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.bucket} ({self.item_count} items) @ {self.built_at:%Y-%m-%d %H:%M}"
+
+
+class NewsChangeCounter(models.Model):
+    """Single row: the last sync version handed out, and the oldest token still servable.
+
+    Writers bump `value` inside their transaction, so the row lock orders
+    commits by version. `horizon` rises when old tombstones are pruned; a
+    client token older than it can no longer be caught up and must resync.
+    """
+
+    value = models.BigIntegerField(default=0)
+    horizon = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"change version {self.value} (horizon {self.horizon})"
+
+
+class NewsTombstone(models.Model):
+    """A purged NewsArticle, kept so delta-sync clients learn to drop it."""
+
+    article_id = models.BigIntegerField()
+    url = models.URLField(max_length=500, blank=True, null=True)
+    bucket = models.CharField(max_length=50, blank=True, null=True)
+    change_version = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"deleted article {self.article_id} @ v{self.change_version}"
+
+
+class NewsBackfillCheckpoint(models.Model):
+    """Where a backfill_news run for one section/locale stopped, so it can resume."""
+
+    bucket = models.CharField(max_length=50)
+    country = models.CharField(max_length=50, blank=True, default="")
+    language = models.CharField(max_length=10, blank=True, default="")
+    # Endpoint + date range the cursor belongs to; a cursor is useless for any other query.
+    query = models.CharField(max_length=100, blank=True, default="")
+    next_page = models.CharField(max_length=255, blank=True, null=True)
+    pages = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        state = "done" if self.finished else f"page {self.pages}"
+        return f"Backfill {self.bucket} [{self.country}:{self.language}] {state}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["country", "language", "bucket"], name="news_backfill_locale_uniq"),
+        ]
+
 
 class NewsConfig(models.Model):
     fetch_enabled = models.BooleanField(default=True)
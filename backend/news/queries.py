@@ -0,0 +1,246 @@
+"""Read-side queries for the news feed: article serialization, the latest
+rows per bucket, and keyset cursors for deeper pages.
+
+The feed queries fetch ARTICLE_COLUMNS as plain tuples (no model instances)
+and leave pubDate as a datetime: the orjson renderer encodes it in C.
+
+A CardShape (?fields=title,image&summary_chars=120) narrows both the columns
+fetched and the keys sent, for list and carousel views that only draw slim
+cards; the default FULL shape is the complete article.
+"""
+import base64
+import binascii
+import json
+
+from django.db import connection
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import NewsArticle
+
+
+# Columns the feed needs; rows come back as tuples in this order.
+ARTICLE_COLUMNS = ("id", "title", "summary", "url", "image", "source", "pubDate", "category", "country", "alt_sources")
+ID, PUB_DATE, CATEGORY = 0, 6, 7
+
+# Keys of a serialized article, in response order.
+CARD_FIELDS = ("title", "summary", "url", "image", "source", "pubDate", "category", "country", "alt_sources")
+
+
+def _truncate(text, chars: int):
+    if not text or len(text) <= chars:
+        return text
+    return text[:chars].rstrip() + "\u2026"
+
+
+class CardShape:
+    """Which article fields a response carries, and how long its summaries may be.
+
+    `columns` is what to SELECT: the requested fields plus id, pubDate and
+    category, which cursors and per-bucket grouping always need; the
+    ID/PUB_DATE/CATEGORY positions in those rows are `id`, `pub_date` and
+    `category`.
+    """
+
+    def __init__(self, fields=None, summary_chars: int = None):
+        self.fields = tuple(f for f in CARD_FIELDS if f in fields) if fields else CARD_FIELDS
+        self.summary_chars = summary_chars
+        self.columns = tuple(
+            c for c in ARTICLE_COLUMNS if c in self.fields or c in ("id", "pubDate", "category")
+        )
+        self.id = self.columns.index("id")
+        self.pub_date = self.columns.index("pubDate")
+        self.category = self.columns.index("category")
+        self.is_full = self.fields == CARD_FIELDS and summary_chars is None
+        # Goes into response cache keys; empty for the default shape so those keys don't change.
+        self.token = "" if self.is_full else f"{','.join(self.fields)}:{summary_chars or ''}"
+
+    @classmethod
+    def from_params(cls, params) -> "CardShape":
+        """Shape from ?fields= and ?summary_chars=; raises ValueError({param: message}) for bad values."""
+        fields = [f.strip() for f in (params.get("fields") or "").split(",") if f.strip()]
+        unknown = sorted(set(fields) - set(CARD_FIELDS))
+        if unknown:
+            raise ValueError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+        summary_chars = params.get("summary_chars")
+        if summary_chars not in (None, ""):
+            try:
+                summary_chars = int(summary_chars)
+            except ValueError:
+                summary_chars = 0
+            if summary_chars < 1:
+                raise ValueError({"summary_chars": "Must be a positive integer."})
+        else:
+            summary_chars = None
+        if not fields and summary_chars is None:
+            return FULL
+        return cls(fields, summary_chars)
+
+    def serialize(self, row: tuple) -> dict:
+        """serialize_row for a tuple of this shape's columns."""
+        if self.is_full:
+            return serialize_row(row)
+        values = dict(zip(self.columns, row))
+        card = {}
+        for field in self.fields:
+            value = values[field]
+            if field == "summary" and self.summary_chars is not None:
+                value = _truncate(value, self.summary_chars)
+            elif field in ("category", "country"):
+                value = [value] if value else []
+            elif field == "alt_sources":
+                value = value or []
+            card[field] = value
+        return card
+
+
+def serialize_article(a: NewsArticle, shape: CardShape = None) -> dict:
+    """Serialize DB model -> response dict (same shape as _normalize_item)."""
+    if shape is not None and not shape.is_full:
+        return shape.serialize(tuple(getattr(a, c) for c in shape.columns))
+    return {
+        "title": a.title,
+        "summary": a.summary,
+        "url": a.url,
+        "image": a.image,
+        "source": a.source,
+        "pubDate": a.pubDate,
+        "category": [a.category] if a.category else [],
+        "country": [a.country] if a.country else [],
+        "alt_sources": a.alt_sources or [],
+    }
+
+
+def serialize_row(row: tuple) -> dict:
+    """serialize_article for an ARTICLE_COLUMNS tuple."""
+    _, title, summary, url, image, source, pub_date, category, country, alt_sources = row
+    return {
+        "title": title,
+        "summary": summary,
+        "url": url,
+        "image": image,
+        "source": source,
+        "pubDate": pub_date,
+        "category": [category] if category else [],
+        "country": [country] if country else [],
+        "alt_sources": alt_sources or [],
+    }
+
+
+FULL = CardShape()
+
+
+# encode_cursor output is well under this; anything longer was not made by us.
+MAX_CURSOR_LENGTH = 200
+MAX_ID = 2 ** 63 - 1
+
+
+def encode_cursor(pub_dt, pk: int) -> str:
+    """Opaque keyset cursor for the row (pub_dt, pk) after which the next page starts."""
+    raw = json.dumps([pub_dt.isoformat() if pub_dt else None, pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Cursor -> (pubDate or None, id); raises ValueError if it was tampered with."""
+    if len(token) > MAX_CURSOR_LENGTH:
+        raise ValueError("bad cursor")
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        pub, pk = json.loads(raw)
+        pub_dt = parse_datetime(pub) if pub is not None else None
+    except (TypeError, ValueError, binascii.Error) as exc:
+        raise ValueError("bad cursor") from exc
+    # bool is an int too; ids outside the bigint range would overflow the DB driver.
+    if type(pk) is not int or not 0 < pk <= MAX_ID or (pub is not None and pub_dt is None):
+        raise ValueError("bad cursor")
+    if pub_dt is not None and timezone.is_naive(pub_dt):
+        raise ValueError("bad cursor")
+    return pub_dt, pk
+
+
+def after_cursor(pub_dt, pk) -> Q:
+    """Rows strictly after (pub_dt, pk) in ORDER BY pubDate DESC, id DESC.
+
+    Where NULL pubDates land depends on the backend (first on PostgreSQL, last
+    on SQLite); we keep the DB's native order so the composite index serves it.
+    """
+    nulls_first = connection.features.nulls_order_largest
+    if pub_dt is None:
+        after = Q(pubDate__isnull=True, id__lt=pk)
+        return after | Q(pubDate__isnull=False) if nulls_first else after
+    # pubDate <= p AND (pubDate < p OR id < pk): a range on the index, then a cheap filter.
+    after = Q(pubDate__lte=pub_dt) & (Q(pubDate__lt=pub_dt) | Q(id__lt=pk))
+    return after if nulls_first else after | Q(pubDate__isnull=True)
+
+
+def _section_page_query(bucket: str, limit: int, cursor, shape):
+    qs = NewsArticle.objects.filter(category=bucket)
+    if cursor:
+        qs = qs.filter(after_cursor(*decode_cursor(cursor)))
+    return qs.order_by("-pubDate", "-id").values_list(*shape.columns)[:limit + 1]
+
+
+def _section_page(rows: list, limit: int, shape):
+    last = rows[limit - 1] if len(rows) > limit else None
+    next_cursor = encode_cursor(last[shape.pub_date], last[shape.id]) if last else None
+    return [shape.serialize(r) for r in rows[:limit]], next_cursor
+
+
+def get_db_section_page(bucket: str, limit: int = 20, cursor: str = None, shape: CardShape = None):
+    """One keyset page of a bucket: (items, next cursor or None).
+
+    Every page is an index seek plus `limit` rows, however deep it is.
+    Raises ValueError for an invalid cursor.
+    """
+    shape = shape or FULL
+    return _section_page(list(_section_page_query(bucket, limit, cursor, shape)), limit, shape)
+
+
+async def aget_db_section_page(bucket: str, limit: int = 20, cursor: str = None, shape: CardShape = None):
+    """get_db_section_page on the async ORM."""
+    shape = shape or FULL
+    query = _section_page_query(bucket, limit, cursor, shape)
+    return _section_page([row async for row in query], limit, shape)
+
+
+def _sections_query(buckets, limit: int, shape):
+    return (
+        NewsArticle.objects
+        .filter(category__in=list(buckets))
+        .annotate(
+            rank=Window(
+                expression=RowNumber(),
+                partition_by=[F("category")],
+                order_by=[F("pubDate").desc(), F("id").desc()],
+            )
+        )
+        .filter(rank__lte=limit)
+        .order_by("category", "rank")
+        .values_list(*shape.columns)
+    )
+
+
+def _group_sections(buckets, rows, shape) -> dict:
+    sections = {bucket: [] for bucket in buckets}
+    for row in rows:
+        sections[row[shape.category]].append(shape.serialize(row))
+    return sections
+
+
+def get_db_sections(buckets, limit: int = 12, shape: CardShape = None) -> dict:
+    """Read the latest items for several buckets in one query.
+
+    Ranks rows per category with ROW_NUMBER() and keeps the top `limit`,
+    in feed order (pubDate DESC, id DESC).
+    """
+    shape = shape or FULL
+    return _group_sections(buckets, _sections_query(buckets, limit, shape), shape)
+
+
+async def aget_db_sections(buckets, limit: int = 12, shape: CardShape = None) -> dict:
+    """get_db_sections on the async ORM."""
+    shape = shape or FULL
+    return _group_sections(buckets, [row async for row in _sections_query(buckets, limit, shape)], shape)
@@ -0,0 +1,95 @@
+"""Retention for NewsArticle: how long each bucket keeps its rows, and the purge.
+
+A bucket's policy is NEWS_RETENTION[bucket] over NEWS_RETENTION["default"]:
+  max_age_days  rows fetched more than this many days ago expire
+  max_rows      only the newest N rows (feed order) are kept
+Either may be None to turn that limit off.
+
+purge_bucket() never issues one big DELETE. It walks the primary key in
+windows of `chunk_size` ids and deletes each window's expired rows in its own
+short transaction, so locks are held briefly and replication keeps up.
+The bucket's snapshot and cached responses are refreshed once at the end.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from .models import NewsArticle
+from .search import unindex_articles
+from .snapshots import publish_buckets
+from .sync import next_change_version, record_tombstones
+from .queries import after_cursor
+
+DEFAULT_POLICY = {"max_age_days": 30, "max_rows": 5000}
+
+
+def retention_policy(bucket: str) -> dict:
+    policies = getattr(settings, "NEWS_RETENTION", {})
+    policy = {**DEFAULT_POLICY, **policies.get("default", {})}
+    policy.update(policies.get(bucket, {}))
+    return policy
+
+
+def expired_filter(bucket: str, policy: dict = None):
+    """Q matching the bucket's expired rows under `policy`, or None if nothing can expire."""
+    policy = policy or retention_policy(bucket)
+    expired = Q()
+
+    if policy.get("max_age_days"):
+        cutoff = timezone.localdate() - timedelta(days=policy["max_age_days"])
+        expired |= Q(fetched_at__lt=cutoff)
+
+    if policy.get("max_rows"):
+        # The first row past the limit; it and everything after it in feed order go.
+        boundary = (
+            NewsArticle.objects
+            .filter(category=bucket)
+            .order_by("-pubDate", "-id")
+            .values_list("pubDate", "id")[policy["max_rows"]:policy["max_rows"] + 1]
+        )
+        for pub_dt, pk in boundary:
+            expired |= Q(id=pk) | after_cursor(pub_dt, pk)
+
+    return expired or None
+
+
+def purge_bucket(bucket: str, policy: dict = None, chunk_size: int = None, pause: float = 0, dry_run: bool = False):
+    """Delete the bucket's expired rows in PK-ranged chunks; yields the running total per chunk.
+
+    With dry_run nothing is deleted and the yielded totals are what would go.
+    """
+    expired = expired_filter(bucket, policy)
+    if expired is None:
+        return
+    chunk_size = chunk_size or getattr(settings, "NEWS_PURGE_CHUNK", 1000)
+
+    qs = NewsArticle.objects.filter(category=bucket).filter(expired)
+    bounds = qs.aggregate(lo=Min("id"), hi=Max("id"))
+    if bounds["lo"] is None:
+        return
+
+    total = 0
+    for start in range(bounds["lo"], bounds["hi"] + 1, chunk_size):
+        window = qs.filter(id__gte=start, id__lt=start + chunk_size)
+        if dry_run:
+            total += window.count()
+        else:
+            with transaction.atomic():
+                rows = list(window.values_list("id", "url", "category"))
+                ids = [pk for pk, _, _ in rows]
+                if ids:
+                    # Delta-sync clients learn about the deletion from the tombstones.
+                    record_tombstones(rows, next_change_version())
+                    NewsArticle.objects.filter(id__in=ids).delete()
+                    unindex_articles(ids)
+            total += len(ids)
+        yield total
+        if pause:
+            time.sleep(pause)
+
+    if total and not dry_run:
+        publish_buckets([bucket])
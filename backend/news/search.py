@@ -0,0 +1,106 @@
+"""Full-text search over NewsArticle.
+
+PostgreSQL: a generated, weighted tsvector column (title A, summary B) with a
+GIN index, so the index is maintained by the database on every write.
+SQLite (development): an FTS5 table with rowid = article id, refreshed by
+ingestion through index_articles(). Anything else falls back to ICONTAINS.
+See migration 0007 for the schema.
+"""
+import re
+
+from django.db import connection
+
+from .models import NewsArticle
+
+FTS_TABLE = "news_article_fts"
+SEARCH_CONFIG = "english"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def index_articles(urls=(), bucket=None, titles=()) -> None:
+    """Refresh the SQLite FTS rows for the given articles (no-op on PostgreSQL)."""
+    if connection.vendor != "sqlite" or not (urls or titles):
+        return
+    ids = []
+    if urls:
+        ids += NewsArticle.objects.filter(url__in=list(urls)).values_list("id", flat=True)
+    if titles:
+        ids += (
+            NewsArticle.objects
+            .filter(category=bucket, url__isnull=True, title__in=list(titles))
+            .values_list("id", flat=True)
+        )
+    if not ids:
+        return
+    marks = ",".join(["%s"] * len(ids))
+    table = NewsArticle._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", ids)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, summary) "
+            f"SELECT id, title, COALESCE(summary, '') FROM {table} WHERE id IN ({marks})",
+            ids,
+        )
+
+
+def unindex_articles(ids) -> None:
+    """Drop deleted articles from the SQLite FTS table (no-op on PostgreSQL)."""
+    if connection.vendor != "sqlite" or not ids:
+        return
+    marks = ",".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", list(ids))
+
+
+def search_articles(query: str, category=None, country=None, limit: int = 20):
+    """Best matches for `query` first; returns NewsArticle instances."""
+    if connection.vendor == "postgresql":
+        return _search_postgres(query, category, country, limit)
+    if connection.vendor == "sqlite":
+        return _search_sqlite(query, category, country, limit)
+
+    qs = NewsArticle.objects.filter(title__icontains=query)
+    if category:
+        qs = qs.filter(category=category)
+    if country:
+        qs = qs.filter(country=country)
+    return list(qs.order_by("-pubDate", "-id")[:limit])
+
+
+def _filters(category, country, alias="a"):
+    sql, params = "", []
+    if category:
+        sql += f" AND {alias}.category = %s"
+        params.append(category)
+    if country:
+        sql += f" AND {alias}.country = %s"
+        params.append(country)
+    return sql, params
+
+
+def _search_postgres(query, category, country, limit):
+    where, params = _filters(category, country)
+    sql = (
+        f"SELECT a.*, ts_rank_cd(a.search_vector, q) AS rank "
+        f"FROM {NewsArticle._meta.db_table} a, websearch_to_tsquery(%s, %s) q "
+        f"WHERE a.search_vector @@ q{where} "
+        f'ORDER BY rank DESC, a."pubDate" DESC NULLS LAST, a.id DESC LIMIT %s'
+    )
+    return list(NewsArticle.objects.raw(sql, [SEARCH_CONFIG, query, *params, limit]))
+
+
+def _search_sqlite(query, category, country, limit):
+    words = _WORD_RE.findall(query)
+    if not words:
+        return []
+    # Quote every term so user input can't inject FTS5 query syntax.
+    match = " ".join('"%s"' % w for w in words)
+    where, params = _filters(category, country)
+    sql = (
+        f"SELECT a.*, bm25({FTS_TABLE}, 10.0, 1.0) AS rank "
+        f"FROM {FTS_TABLE} f JOIN {NewsArticle._meta.db_table} a ON a.id = f.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s{where} "
+        f"ORDER BY rank, a.id DESC LIMIT %s"
+    )
+    return list(NewsArticle.objects.raw(sql, [match, *params, limit]))
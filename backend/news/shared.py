@@ -0,0 +1,217 @@
+"""One memory-mapped copy of every section snapshot, shared by all workers on a host.
+
+publish_shared_snapshot() writes the pre-encoded JSON of every bucket's
+NewsSectionSnapshot, plus the fetch log, into a single immutable file at
+NEWS_SHARED_SNAPSHOT and renames it into place. Workers map that file
+read-only: the section JSON lives once in the page cache however many
+processes serve it, and the home feed is spliced straight from the mapping
+with no query and no per-process copy of the articles.
+
+Each request stats the path (the per-request version check); a new inode
+means a new snapshot, which is mapped in place of the old one. Mappings still
+referenced by in-flight responses stay valid until those are done.
+
+The file records the bucket generations (news.cache) it was built at, and
+that of the fetch log (FETCH_LOG). A snapshot is only served while none of
+them has moved past it; a worker that finds it behind (ingestion ran on
+another host, a publish was skipped while another held the lease, or the
+file was lost) republishes it from the database, once per lease.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .cache import FETCH_LOG, bucket_generations
+from .locks import acquire_lease, release_lease
+from .models import NewsFetchLog, NewsSectionSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BMNEWS1\n"
+# Snapshot version (time_ns at publish) and the length of the JSON index that follows.
+HEADER = struct.Struct("<QI")
+
+# Duck-types NewsSectionSnapshot for news.snapshots.home_body/category_body;
+# the JSON fields are memoryviews into the mapping.
+SharedSection = namedtuple("SharedSection", "home_json page_json next_cursor item_count")
+
+
+def snapshot_path() -> str:
+    """Where the shared snapshot lives; "" (the default) when NEWS_SHARED_SNAPSHOT is not set.
+
+    There is deliberately no fallback location: a fixed name in the temp dir
+    would be shared by every deployment on the host, and could be planted by
+    any local user.
+    """
+    return str(getattr(settings, "NEWS_SHARED_SNAPSHOT", None) or "")
+
+
+class SharedSnapshot:
+    """A mapped snapshot file: `sections` by bucket, the generations it covers, its fetch log."""
+
+    def __init__(self, path: str, key):
+        self.key = key
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if view[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a news snapshot")
+        self.version, index_len = HEADER.unpack_from(view, len(MAGIC))
+        start = len(MAGIC) + HEADER.size
+        index = json.loads(bytes(view[start:start + index_len]))
+        data = start + index_len
+
+        self.generations = index["generations"]
+        self.sections = {
+            bucket: SharedSection(
+                view[data + home_off:data + home_off + home_len],
+                view[data + page_off:data + page_off + page_len],
+                next_cursor, item_count,
+            )
+            for bucket, (home_off, home_len, page_off, page_len, next_cursor, item_count)
+            in index["sections"].items()
+        }
+        self._fetches = {}
+        for bucket, country, language, fetched_at, outcome in index["fetches"]:
+            self._fetches.setdefault((country, language), []).append(
+                (bucket, datetime.fromisoformat(fetched_at), outcome)
+            )
+
+    def covers(self, buckets, generations: dict) -> bool:
+        """True if every bucket is in here and everything in `generations` is at least as new as it says."""
+        return all(b in self.sections for b in buckets) and all(
+            self.generations.get(name, 0) >= generation for name, generation in generations.items()
+        )
+
+    def fetch_log(self, country, language):
+        """(bucket, fetched_at, outcome) rows for a locale as of publishing, or None if it has none."""
+        return self._fetches.get((country or "", language or ""))
+
+
+_current = None
+_map_lock = threading.Lock()
+
+
+def get_shared_snapshot():
+    """The current SharedSnapshot, remapped if the file changed since the last call; None if there is none."""
+    global _current
+    path = snapshot_path()
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    current = _current
+    if current is not None and current.key == key:
+        return current
+    with _map_lock:
+        if _current is None or _current.key != key:
+            try:
+                _current = SharedSnapshot(path, key)
+            except (OSError, ValueError, KeyError):
+                logger.exception("Could not map the shared news snapshot at %s", path)
+                return None
+        return _current
+
+
+def _encode_file(version: int, generations: dict, snapshots, fetches) -> bytes:
+    data, sections, offset = [], {}, 0
+    for s in snapshots:
+        home, page = s.home_json.encode("utf-8"), s.page_json.encode("utf-8")
+        sections[s.bucket] = [offset, len(home), offset + len(home), len(page), s.next_cursor, s.item_count]
+        data += [home, page]
+        offset += len(home) + len(page)
+    index = json.dumps(
+        {
+            "generations": generations,
+            "sections": sections,
+            "fetches": [[b, c, l, at.isoformat(), o] for b, c, l, at, o in fetches],
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return b"".join([MAGIC, HEADER.pack(version, len(index)), index, *data])
+
+
+def publish_shared_snapshot() -> bool:
+    """Rebuild the shared snapshot from the stored section snapshots; False if skipped.
+
+    Generations are read before the rows, so the file never claims to be
+    newer than its contents. They never go backwards either: with a
+    per-process cache each worker has its own idea of them.
+    """
+    path = snapshot_path()
+    if not path:
+        return False
+    token = acquire_lease("shared-snapshot", ttl=30)
+    if not token:
+        return False
+    try:
+        snapshots = NewsSectionSnapshot.objects.order_by("bucket")
+        buckets = list(snapshots.values_list("bucket", flat=True))
+        generations = bucket_generations(buckets + [FETCH_LOG])
+        previous = get_shared_snapshot()
+        if previous is not None:
+            for b in generations:
+                generations[b] = max(generations[b], previous.generations.get(b, 0))
+        body = _encode_file(
+            time.time_ns(),
+            generations,
+            list(snapshots.filter(bucket__in=buckets)),
+            NewsFetchLog.objects.values_list("bucket", "country", "language", "fetched_at", "outcome"),
+        )
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write beside the target and rename over it: readers see the old file or the new one, never half.
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".news-snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.chmod(tmp, 0o644)  # mkstemp's 0600 would lock out workers running as another user
+            os.replace(tmp, path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+        return True
+    except OSError:
+        logger.exception("Could not publish the shared news snapshot to %s", path)
+        return False
+    finally:
+        release_lease("shared-snapshot", token)
+
+
+def current_snapshot(buckets, generations: dict):
+    """The shared snapshot if it is current for `buckets`, republishing it once if it is behind.
+
+    Include FETCH_LOG in `generations` when the caller relies on fetch_log().
+    """
+    shared = get_shared_snapshot()
+    if shared is None or not shared.covers(buckets, generations):
+        if shared is not None and any(b not in shared.sections for b in buckets):
+            # Republishing won't help before ingestion has built every section.
+            return None
+        if not publish_shared_snapshot():
+            return None
+        shared = get_shared_snapshot()
+        if shared is None or not shared.covers(buckets, generations):
+            return None
+    return shared
+
+
+async def acurrent_snapshot(buckets, generations: dict):
+    """current_snapshot for the event loop; only the (rare) republish leaves it."""
+    shared = get_shared_snapshot()
+    if shared is not None and shared.covers(buckets, generations):
+        return shared
+    return await sync_to_async(current_snapshot)(buckets, generations)
@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .config import invalidate_news_config
+from .models import NewsConfig
+
+
+@receiver([post_save, post_delete], sender=NewsConfig)
+def news_config_changed(sender, **kwargs):
+    # After commit, or another worker could reload the old row under the new version.
+    transaction.on_commit(invalidate_news_config)
@@ -0,0 +1,94 @@
+"""Pre-encoded JSON snapshots of each bucket's newest items.
+
+Ingestion rebuilds a bucket's snapshot after every write, so the home page and
+the first page of a category are served by splicing stored JSON text into the
+response body: no model instances, no per-article serialization, no DRF
+re-encoding on the read path. Requests that don't match a snapshot (a cursor,
+a custom limit, a bucket not built yet) fall back to news.queries.
+
+Every publish also rewrites the host's memory-mapped copy of all snapshots
+(news.shared), which the home feed reads without touching the database.
+"""
+from django.db import transaction
+
+from backend.renderers import dumps
+
+from .cache import invalidate_buckets
+from .models import NewsArticle, NewsSectionSnapshot
+from .queries import ARTICLE_COLUMNS, ID, PUB_DATE, encode_cursor, serialize_row
+from .shared import publish_shared_snapshot
+
+# Home shows this many items per bucket; a category's first page this many.
+HOME_SIZE = 12
+PAGE_SIZE = 20
+
+
+def encode(payload) -> str:
+    """JSON text exactly as the API's ORJSONRenderer would emit it."""
+    return dumps(payload).decode("utf-8")
+
+
+def build_snapshots(buckets) -> None:
+    """Re-encode the newest items of `buckets` and upsert their snapshots."""
+    snapshots = []
+    for bucket in buckets:
+        rows = list(
+            NewsArticle.objects
+            .filter(category=bucket)
+            .order_by("-pubDate", "-id")
+            .values_list(*ARTICLE_COLUMNS)[:PAGE_SIZE + 1]
+        )
+        items = [serialize_row(r) for r in rows[:PAGE_SIZE]]
+        last = rows[PAGE_SIZE - 1] if len(rows) > PAGE_SIZE else None
+        snapshots.append(NewsSectionSnapshot(
+            bucket=bucket,
+            home_json=encode(items[:HOME_SIZE]),
+            page_json=encode(items),
+            next_cursor=encode_cursor(last[PUB_DATE], last[ID]) if last else None,
+            item_count=len(items),
+        ))
+    with transaction.atomic():
+        NewsSectionSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=["bucket"],
+            update_fields=["home_json", "page_json", "next_cursor", "item_count", "built_at"],
+        )
+
+
+def publish_buckets(buckets) -> None:
+    """After a write: rebuild the snapshots, orphan cached responses for `buckets`, republish the shared copy."""
+    build_snapshots(buckets)
+    invalidate_buckets(buckets)
+    publish_shared_snapshot()
+
+
+def load_snapshots(buckets) -> dict:
+    """{bucket: NewsSectionSnapshot} for the buckets that have one."""
+    return {s.bucket: s for s in NewsSectionSnapshot.objects.filter(bucket__in=list(buckets))}
+
+
+async def aload_snapshots(buckets) -> dict:
+    """load_snapshots on the async ORM."""
+    return {s.bucket: s async for s in NewsSectionSnapshot.objects.filter(bucket__in=list(buckets))}
+
+
+def _raw(json_text):
+    # Snapshot rows hold str; shared-snapshot sections hold memoryviews of UTF-8, joined as they are.
+    return json_text.encode("utf-8") if isinstance(json_text, str) else json_text
+
+
+def home_body(buckets, snapshots: dict) -> bytes:
+    """The home payload ({bucket: [...], ...}) spliced from snapshot text."""
+    parts = []
+    for b in buckets:
+        parts += [b",", dumps(b), b":", _raw(snapshots[b].home_json)]
+    parts[:1] = [b"{"]
+    return b"".join(parts + [b"}"])
+
+
+def category_body(bucket: str, snapshot: NewsSectionSnapshot, stale: bool) -> bytes:
+    return b"".join([
+        b'{"category":', dumps(bucket), b',"items":', _raw(snapshot.page_json),
+        b',"stale":', dumps(stale), b',"next":', dumps(snapshot.next_cursor), b"}",
+    ])
@@ -0,0 +1,121 @@
+"""Delta sync: what changed in the news table since a client's last sync.
+
+Every write transaction on NewsArticle takes one version from the
+NewsChangeCounter row (next_change_version) and stamps it on the rows it
+inserts or updates; purges stamp it on the tombstones they leave. Because the
+counter row stays locked until that transaction commits, versions become
+visible in order, so "all versions <= the counter" is a consistent cut.
+
+Sync tokens are opaque to clients: "<version>" means everything up to that
+version was delivered; "<version>-<id>" is a page boundary inside one
+version. A quiet sync (token == current version) costs one counter read.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import NewsArticle, NewsChangeCounter, NewsTombstone
+from .queries import ARTICLE_COLUMNS, ID, MAX_ID, serialize_row
+
+CHANGE_COLUMNS = ARTICLE_COLUMNS + ("change_version",)
+VERSION = len(ARTICLE_COLUMNS)
+
+
+class SyncReset(Exception):
+    """The token predates the retained tombstones (or is garbage); the client must resync from scratch."""
+
+
+def next_change_version() -> int:
+    """Take the next version; call inside the transaction that writes the changes."""
+    with transaction.atomic():
+        if not NewsChangeCounter.objects.filter(id=1).update(value=F("value") + 1):
+            NewsChangeCounter.objects.get_or_create(id=1)
+            NewsChangeCounter.objects.filter(id=1).update(value=F("value") + 1)
+        return NewsChangeCounter.objects.values_list("value", flat=True).get(id=1)
+
+
+def _counter():
+    counter = NewsChangeCounter.objects.filter(id=1).values_list("value", "horizon").first()
+    return counter or (0, 0)
+
+
+def parse_token(token):
+    """Token -> (version, id after which to resume within that version); None means a full sync."""
+    if not token:
+        return -1, None
+    try:
+        version, sep, pk = token.partition("-")
+        version, pk = int(version), (int(pk) if sep else None)
+    except ValueError:
+        raise SyncReset("bad token") from None
+    # Out-of-range ids would overflow the DB driver rather than match nothing.
+    if pk is not None and not 0 < pk <= MAX_ID:
+        raise SyncReset("bad token")
+    return version, pk
+
+
+def record_tombstones(rows, version: int) -> None:
+    """rows: (id, url, category) of the articles about to be deleted."""
+    NewsTombstone.objects.bulk_create(
+        [NewsTombstone(article_id=pk, url=url, bucket=bucket, change_version=version) for pk, url, bucket in rows]
+    )
+
+
+def prune_tombstones(days: int = None) -> int:
+    """Drop tombstones older than NEWS_SYNC_TOMBSTONE_DAYS and raise the horizon past them."""
+    days = days if days is not None else getattr(settings, "NEWS_SYNC_TOMBSTONE_DAYS", 30)
+    old = NewsTombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days))
+    with transaction.atomic():
+        newest = old.order_by("-change_version").values_list("change_version", flat=True).first()
+        if newest is None:
+            return 0
+        deleted, _ = old.filter(change_version__lte=newest).delete()
+        NewsChangeCounter.objects.get_or_create(id=1)
+        NewsChangeCounter.objects.filter(id=1, horizon__lt=newest).update(horizon=newest)
+    return deleted
+
+
+def changes_since(token=None, limit: int = 500, buckets=None) -> dict:
+    """{"changed": [...], "deleted": [...], "next": token, "more": bool} after `token`.
+
+    Raises SyncReset when the client has to start over without a token.
+    """
+    since, after_id = parse_token(token)
+    current, horizon = _counter()
+    if since >= 0 and since < horizon or since > current:
+        raise SyncReset("token out of range")
+    if since == current and after_id is None:
+        return {"changed": [], "deleted": [], "next": str(current), "more": False}
+
+    qs = NewsArticle.objects.filter(change_version__lte=current)
+    if after_id is None:
+        qs = qs.filter(change_version__gt=since)
+    else:
+        qs = qs.filter(Q(change_version__gt=since) | Q(change_version=since, id__gt=after_id))
+    if buckets:
+        qs = qs.filter(category__in=list(buckets))
+    rows = list(qs.order_by("change_version", "id").values_list(*CHANGE_COLUMNS)[:limit + 1])
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    # Tombstones carry their own versions, so a page covers those up to where its rows end.
+    upto = rows[-1][VERSION] if more else current
+    tombstones = NewsTombstone.objects.filter(change_version__gt=since, change_version__lte=upto)
+    if buckets:
+        tombstones = tombstones.filter(bucket__in=list(buckets))
+    if since < 0:
+        # A full sync starts from nothing; there is nothing to delete.
+        tombstones = tombstones.none()
+
+    return {
+        "changed": [{"id": r[ID], **serialize_row(r[:VERSION])} for r in rows],
+        "deleted": [
+            {"id": pk, "url": url, "bucket": bucket}
+            for pk, url, bucket in tombstones.order_by("change_version", "id").values_list("article_id", "url", "bucket")
+        ],
+        "next": f"{rows[-1][VERSION]}-{rows[-1][ID]}" if more else str(current),
+        "more": more,
+    }
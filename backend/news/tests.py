@@ -1,3 +1,1044 @@
-from django.test import TestCase
+import asyncio
+import base64
+import gzip
+import json
+import os
+import tempfile
+import threading
+from unittest import mock, skipUnless
+from datetime import date, timedelta
 
-# Create your tests here.
+import requests
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from backend.middleware import CompressionMiddleware
+
+from .backfill import run_backfill
+from .breaker import CircuitBreaker
+from .client import AsyncNewsdataClient, NewsdataClient, NewsdataError, get_client
+from .ingestion import (
+    SECTIONS, arefresh_sections, fetch_sections_batched, fresh_buckets, record_fetches, refresh_sections,
+    schedule_refresh, store_news_items,
+)
+from .live import catch_up
+from .locks import COMPARE_AND_DELETE, acquire_lease, release_lease
+from .models import NewsArticle, NewsBackfillCheckpoint, NewsConfig, NewsFetchLog, NewsTombstone
+from .queries import CardShape, after_cursor, decode_cursor, encode_cursor, get_db_section_page, get_db_sections
+from .retention import purge_bucket
+from .search import _search_postgres
+from .shared import get_shared_snapshot, publish_shared_snapshot
+from .snapshots import publish_buckets
+from .sync import changes_since, prune_tombstones
+
+
+def news_item(title, url=None, **fields):
+    """A provider item as _normalize_item returns it."""
+    return {
+        "title": title,
+        "summary": fields.get("summary", f"Summary of {title}"),
+        "url": url,
+        "image": fields.get("image"),
+        "source": fields.get("source", "example"),
+        "pubDate": fields.get("pubDate", "2026-10-01 08:00:00"),
+        "category": fields.get("category", []),
+        "country": fields.get("country", []),
+    }
+
+
+class HotQueryPlanTests(TestCase):
+    """Guard the indexes behind the news read path against regressions."""
+
+    def setUp(self):
+        NewsArticle.objects.bulk_create(
+            NewsArticle(title=f"story {i}", url=f"https://example.com/{i}", category=bucket)
+            for i, bucket in enumerate(["technology", "sports", "health"] * 20)
+        )
+        if connection.vendor == "postgresql":
+            # A tiny table is cheaper to scan; make the planner show its hand.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, qs, index_name=None):
+        plan = qs.explain()
+        self.assertRegex(plan, r"(?i)index", plan)
+        if index_name:
+            self.assertIn(index_name, plan)
+
+    def test_section_read_uses_category_pubdate_index(self):
+        qs = NewsArticle.objects.filter(category="technology").order_by("-pubDate", "-id")[:12]
+        self.assertUsesIndex(qs, "news_cat_pubdate_idx")
+
+    def test_keyset_page_uses_category_pubdate_index(self):
+        after = after_cursor(timezone.now(), 10)
+        qs = NewsArticle.objects.filter(after, category="technology").order_by("-pubDate", "-id")[:21]
+        self.assertUsesIndex(qs, "news_cat_pubdate_idx")
+
+    def test_fetched_on_lookup_uses_category_fetched_index(self):
+        qs = NewsArticle.objects.filter(category="technology", fetched_at=date.today())
+        self.assertUsesIndex(qs, "news_cat_fetched_idx")
+
+    def test_freshness_check_uses_fetch_log_index(self):
+        qs = NewsFetchLog.objects.filter(country="us", language="en", bucket__in=["technology", "sports"])
+        self.assertUsesIndex(qs)
+
+    def test_url_lookup_uses_unique_index(self):
+        self.assertUsesIndex(NewsArticle.objects.filter(url="https://example.com/1"))
+
+
+@override_settings(NEWS_SHARED_SNAPSHOT="", NEWS_CONFIG_TTL=0)
+class NewsAPITestCase(TestCase):
+    """Views against a clean cache, with provider refreshes switched off."""
+
+    def setUp(self):
+        cache.clear()
+        NewsConfig.objects.update_or_create(id=1, defaults={"fetch_enabled": False})
+
+
+@override_settings(NEWS_DEDUPE_ENABLED=False)
+class StoreNewsItemsTests(TestCase):
+    def test_inserts_new_items(self):
+        stats = store_news_items("technology", [
+            news_item("Chip makers report record quarter", "https://example.com/chips"),
+            news_item("Open source compiler hits 1.0", "https://example.com/compiler"),
+        ], country="us")
+
+        self.assertEqual(stats["inserted"], 2)
+        self.assertEqual(stats["updated"], 0)
+        article = NewsArticle.objects.get(url="https://example.com/chips")
+        self.assertEqual((article.category, article.country), ("technology", "us"))
+        self.assertIsNotNone(article.pubDate)
+
+    def test_same_url_updates_the_row(self):
+        store_news_items("technology", [news_item("Draft headline", "https://example.com/a")])
+        stats = store_news_items("technology", [news_item("Final headline", "https://example.com/a")])
+
+        self.assertEqual((stats["inserted"], stats["updated"]), (0, 1))
+        self.assertEqual(NewsArticle.objects.get().title, "Final headline")
+
+    def test_items_without_url_match_on_title_and_bucket(self):
+        store_news_items("sports", [news_item("Derby ends level")])
+        stats = store_news_items("sports", [news_item("Derby ends level", summary="Late equaliser.")])
+
+        self.assertEqual((stats["inserted"], stats["updated"]), (0, 1))
+        self.assertEqual(NewsArticle.objects.get(category="sports").summary, "Late equaliser.")
+
+        # The same title in another bucket is a different article.
+        store_news_items("world", [news_item("Derby ends level")])
+        self.assertEqual(NewsArticle.objects.filter(title="Derby ends level").count(), 2)
+
+    def test_unchanged_items_are_not_rewritten(self):
+        items = [news_item("Rates held steady", "https://example.com/rates"), news_item("Markets close flat")]
+        store_news_items("business", items)
+        versions = dict(NewsArticle.objects.values_list("title", "change_version"))
+
+        stats = store_news_items("business", items)
+
+        self.assertEqual(stats["unchanged"], 2)
+        self.assertEqual((stats["inserted"], stats["updated"]), (0, 0))
+        self.assertEqual(dict(NewsArticle.objects.values_list("title", "change_version")), versions)
+
+    def test_duplicates_within_a_batch_are_skipped(self):
+        stats = store_news_items("health", [
+            news_item("Clinic opens downtown", "https://example.com/clinic"),
+            news_item("Clinic opens downtown (updated)", "https://example.com/clinic"),
+            news_item("Flu season starts early"),
+            news_item("Flu season starts early"),
+            news_item("", None),
+        ])
+
+        self.assertEqual((stats["inserted"], stats["skipped"]), (2, 3))
+        self.assertEqual(NewsArticle.objects.count(), 2)
+        self.assertEqual(NewsArticle.objects.get(url="https://example.com/clinic").title, "Clinic opens downtown")
+
+
+class NearDuplicateTests(TestCase):
+    def test_batch_duplicates_add_to_the_stored_sources(self):
+        store_news_items("world", [news_item("Summit opens in Geneva", "https://a.example/summit")])
+        NewsArticle.objects.update(
+            alt_sources=[{"source": "b", "url": "https://b.example/summit"}],
+            fetched_at=date.today() - timedelta(days=30),  # out of the dedupe window: matched on URL only
+        )
+
+        stats = store_news_items("world", [
+            news_item("Summit opens in Geneva", "https://a.example/summit"),
+            news_item("Summit opens in Geneva", "https://c.example/summit", source="c"),
+            news_item("Summit opens in Geneva", "https://b.example/summit", source="b"),
+        ])
+
+        self.assertEqual((stats["updated"], stats["merged"]), (1, 2))
+        self.assertEqual(NewsArticle.objects.get().alt_sources, [
+            {"source": "b", "url": "https://b.example/summit"},
+            {"source": "c", "url": "https://c.example/summit"},
+        ])
+
+        stats = store_news_items("world", [news_item("Summit opens in Geneva", "https://a.example/summit")])
+        self.assertEqual(stats["unchanged"], 1)
+        self.assertEqual(len(NewsArticle.objects.get().alt_sources), 2)
+
+    @override_settings(NEWS_DEDUPE_ENABLED=False)
+    def test_updates_keep_the_stored_sources(self):
+        store_news_items("world", [news_item("Draft", "https://a.example/x")])
+        NewsArticle.objects.update(alt_sources=[{"source": "b", "url": "https://b.example/x"}])
+
+        store_news_items("world", [news_item("Final", "https://a.example/x")])
+
+        article = NewsArticle.objects.get()
+        self.assertEqual(article.title, "Final")
+        self.assertEqual(article.alt_sources, [{"source": "b", "url": "https://b.example/x"}])
+
+
+@override_settings(NEWS_DEDUPE_ENABLED=False)
+class SearchTests(NewsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        store_news_items("world", [
+            news_item("Climate summit opens", "https://example.com/summit", summary="Leaders meet on emissions."),
+            news_item("Ministers meet", "https://example.com/ministers", summary="Climate is on the agenda."),
+        ], country="us")
+        store_news_items("business", [
+            news_item("Climate funds grow", "https://example.com/funds", summary="Green bonds."),
+        ], country="in")
+
+    def search(self, **params):
+        response = self.client.get("/api/news/search/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item["title"] for item in response.json()["items"]]
+
+    def test_title_matches_rank_above_summary_matches(self):
+        titles = self.search(q="climate")
+        self.assertEqual(set(titles), {"Climate summit opens", "Ministers meet", "Climate funds grow"})
+        self.assertEqual(titles[-1], "Ministers meet")
+
+    def test_category_and_country_filters(self):
+        self.assertEqual(set(self.search(q="climate", category="world")), {"Climate summit opens", "Ministers meet"})
+        self.assertEqual(self.search(q="climate", country="in"), ["Climate funds grow"])
+        self.assertEqual(self.search(q="climate", category="world", country="in"), [])
+
+    def test_query_syntax_is_treated_as_words(self):
+        self.assertEqual(self.search(q='summit" OR NEAR(climate'), [])
+        self.assertEqual(self.search(q="title:summit"), [])
+        self.assertEqual(self.search(q="summit*"), ["Climate summit opens"])
+        self.assertEqual(self.search(q="*** ()"), [])
+        self.assertEqual(self.client.get("/api/news/search/", {"q": "  "}).status_code, 400)
+
+    def test_index_follows_updates_and_purges(self):
+        store_news_items("world", [news_item("Heatwave warning", "https://example.com/summit")], country="us")
+        self.assertEqual(self.search(q="summit"), [])
+        self.assertEqual(self.search(q="heatwave"), ["Heatwave warning"])
+
+        NewsArticle.objects.filter(url="https://example.com/ministers").update(pubDate=timezone.now() - timedelta(days=30))
+        list(purge_bucket("world", policy={"max_age_days": None, "max_rows": 1}))
+        self.assertEqual(self.search(q="climate", category="world"), [])
+        self.assertEqual(self.search(q="heatwave"), ["Heatwave warning"])
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+    def test_postgres_search_uses_the_weighted_tsvector(self):
+        results = _search_postgres("climate", None, None, 10)
+        self.assertEqual([a.title for a in results][-1], "Ministers meet")
+        self.assertTrue(all(a.rank > 0 for a in results))
+        self.assertEqual([a.title for a in _search_postgres("climate -summit", "world", "us", 10)], ["Ministers meet"])
+
+
+class KeysetPagingTests(NewsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now().replace(microsecond=0)
+        # Ties on pubDate, plus rows without one, to exercise both halves of after_cursor.
+        dates = [now] * 5 + [now - timedelta(hours=1)] * 3 + [None] * 4
+        NewsArticle.objects.bulk_create(
+            NewsArticle(title=f"story {i}", url=f"https://example.com/{i}", category="world", pubDate=d)
+            for i, d in enumerate(dates)
+        )
+
+    def feed_order(self):
+        return list(NewsArticle.objects.filter(category="world").order_by("-pubDate", "-id").values_list("url", flat=True))
+
+    def walk(self, limit):
+        urls, cursor = [], None
+        while True:
+            items, cursor = get_db_section_page("world", limit=limit, cursor=cursor)
+            urls += [item["url"] for item in items]
+            if cursor is None:
+                return urls
+
+    def test_pages_cover_every_row_once_in_feed_order(self):
+        for limit in (1, 2, 3, 5, 12, 20):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.walk(limit), self.feed_order())
+
+    def test_cursor_round_trip(self):
+        pub = timezone.now().replace(microsecond=0)
+        self.assertEqual(decode_cursor(encode_cursor(pub, 42)), (pub, 42))
+        self.assertEqual(decode_cursor(encode_cursor(None, 7)), (None, 7))
+
+    def test_malformed_cursors_are_rejected(self):
+        def token(value):
+            return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+        for bad in [
+            "not-a-cursor", "", "x" * 500,
+            token(["2026-10-01T00:00:00+00:00"]),
+            token(["yesterday", 1]),
+            token(["2026-10-01T00:00:00", 1]),  # naive
+            token([None, "1"]),
+            token([None, True]),
+            token([None, 0]),
+            token([None, 2 ** 63]),
+            token([None, 10 ** 30]),
+        ]:
+            with self.subTest(cursor=bad), self.assertRaises(ValueError):
+                decode_cursor(bad)
+
+    def test_bad_cursor_is_a_400(self):
+        oversized = base64.urlsafe_b64encode(json.dumps([None, 10 ** 30]).encode()).decode()
+        for cursor in ("garbage", oversized):
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/news/category/world/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("cursor", response.json())
+
+
+@override_settings(NEWS_DEDUPE_ENABLED=False)
+class DeltaSyncTests(NewsAPITestCase):
+    def store(self, bucket, *titles):
+        return store_news_items(bucket, [news_item(t, f"https://example.com/{bucket}/{t}") for t in titles])
+
+    def sync(self, **params):
+        response = self.client.get("/api/news/sync/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_then_incremental_sync(self):
+        self.store("world", "one", "two")
+        first = self.sync()
+        self.assertEqual(sorted(c["title"] for c in first["changed"]), ["one", "two"])
+        self.assertEqual((first["deleted"], first["more"], first["reset"]), ([], False, False))
+
+        self.assertEqual(self.sync(since=first["next"])["changed"], [])
+
+        self.store("world", "three")
+        NewsArticle.objects.filter(title="one").update(summary="rewritten")  # not a tracked write
+        second = self.sync(since=first["next"])
+        self.assertEqual([c["title"] for c in second["changed"]], ["three"])
+        self.assertGreater(int(second["next"]), int(first["next"]))
+
+    def test_unchanged_refresh_does_not_bump_the_version(self):
+        self.store("world", "one")
+        token = self.sync()["next"]
+        self.store("world", "one")
+        self.assertEqual(self.sync(since=token), {"changed": [], "deleted": [], "next": token, "more": False, "reset": False})
+
+    def test_paging_inside_one_version(self):
+        self.store("world", *[f"story {i}" for i in range(5)])
+        seen, token, pages = [], None, 0
+        while True:
+            page = self.sync(limit=2, **({"since": token} if token else {}))
+            seen += [c["id"] for c in page["changed"]]
+            token, pages = page["next"], pages + 1
+            if not page["more"]:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(seen), sorted(NewsArticle.objects.values_list("id", flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_purged_rows_come_back_as_tombstones(self):
+        self.store("world", "old", "new")
+        token = self.sync()["next"]
+        old = NewsArticle.objects.get(title="old")
+        NewsArticle.objects.filter(pk=old.pk).update(pubDate=timezone.now() - timedelta(days=3650))
+
+        list(purge_bucket("world", policy={"max_age_days": None, "max_rows": 1}))
+
+        page = self.sync(since=token)
+        self.assertEqual(page["changed"], [])
+        self.assertEqual(page["deleted"], [{"id": old.pk, "url": old.url, "bucket": "world"}])
+        # A full sync has nothing to delete.
+        self.assertEqual(self.sync()["deleted"], [])
+
+    def test_bucket_filter(self):
+        self.store("world", "abroad")
+        self.store("sports", "match")
+        page = self.sync(buckets="sports")
+        self.assertEqual([c["title"] for c in page["changed"]], ["match"])
+
+    def test_token_older_than_the_tombstones_forces_a_resync(self):
+        self.store("world", "old", "new")
+        token = self.sync()["next"]
+        old = NewsArticle.objects.get(title="old")
+        NewsArticle.objects.filter(pk=old.pk).update(pubDate=timezone.now() - timedelta(days=3650))
+        list(purge_bucket("world", policy={"max_age_days": None, "max_rows": 1}))
+        NewsTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=90))
+
+        self.assertEqual(prune_tombstones(days=30), 1)
+
+        page = self.sync(since=token)
+        self.assertEqual(page, {"reset": True, "changed": [], "deleted": [], "next": None, "more": False})
+        # Starting over works.
+        self.assertEqual([c["title"] for c in self.sync()["changed"]], ["new"])
+
+    def test_bad_tokens_force_a_resync(self):
+        self.store("world", "one")
+        current = int(self.sync()["next"])
+        for token in ("garbage", str(current + 1), f"{current}-{2 ** 64}", f"{current}-0"):
+            with self.subTest(token=token):
+                self.assertTrue(self.sync(since=token)["reset"])
+
+    def test_changes_since_without_a_token_is_everything(self):
+        self.store("health", "a", "b", "c")
+        self.assertEqual(len(changes_since(None)["changed"]), 3)
+
+
+@override_settings(NEWS_DEDUPE_ENABLED=False)
+class HomeFeedTests(NewsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for bucket in SECTIONS:
+            store_news_items(bucket, [news_item(f"{bucket} lead story", f"https://example.com/{bucket}/lead")])
+
+    def assertSectionsOnly(self, response):
+        payload = response.json()
+        self.assertEqual(list(payload), list(SECTIONS))
+        self.assertTrue(all(isinstance(items, list) for items in payload.values()))
+
+    def test_payload_holds_only_sections_and_staleness_is_a_header(self):
+        for url in ("/api/news/home/", "/api/news/async/home/"):
+            with self.subTest(url=url):
+                cache.clear()
+                miss = self.client.get(url)
+                hit = self.client.get(url)
+                self.assertEqual((miss["X-Cache"], hit["X-Cache"]), ("MISS", "HIT"))
+                for response in (miss, hit):
+                    self.assertSectionsOnly(response)
+                    self.assertEqual(response["X-News-Stale"], "false")
+
+    def test_stale_sections_are_flagged(self):
+        NewsConfig.objects.filter(id=1).update(fetch_enabled=True)
+        cache.clear()
+        with mock.patch("news.views.schedule_refresh") as schedule:
+            response = self.client.get("/api/news/home/")
+        self.assertEqual(response["X-News-Stale"], "true")
+        self.assertSectionsOnly(response)
+        schedule.assert_called_once()
+
+        NewsFetchLog.objects.bulk_create(
+            NewsFetchLog(bucket=b, country="us", language="en", fetched_at=timezone.now()) for b in SECTIONS
+        )
+        cache.clear()
+        self.assertEqual(self.client.get("/api/news/home/")["X-News-Stale"], "false")
+
+    def test_snapshot_and_shared_paths_match_the_query_path(self):
+        queried = self.client.get("/api/news/home/")
+        publish_buckets(list(SECTIONS))
+        cache.clear()
+        from_snapshots = self.client.get("/api/news/home/")
+        self.assertEqual(from_snapshots.content, queried.content)
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(NEWS_SHARED_SNAPSHOT=os.path.join(tmp, "snap")):
+            publish_buckets(list(SECTIONS))
+            shared = self.client.get("/api/news/home/")
+            self.assertEqual(shared["X-Cache"], "SHARED")
+            self.assertEqual(shared["X-News-Stale"], "false")
+            self.assertEqual(shared.content, queried.content)
+
+
+class ConditionalGetTests(NewsAPITestCase):
+    def test_writes_from_another_process_change_the_etag(self):
+        store_news_items("world", [news_item("Summit opens", "https://example.com/summit")])
+        publish_buckets(["world"])
+
+        for url in ("/api/news/category/world/", "/api/news/async/category/world/", "/api/news/home/"):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+                # A writer in another process bumps its own per-process cache, not ours.
+                title = f"Talks continue ({url})"
+                with mock.patch("news.snapshots.invalidate_buckets"), self.captureOnCommitCallbacks(execute=True):
+                    store_news_items("world", [news_item(title, f"https://example.com/{len(url)}")])
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+                self.assertIn(title, response.content.decode())
+
+
+    def test_revalidation_still_checks_freshness(self):
+        NewsConfig.objects.filter(id=1).update(fetch_enabled=True)
+        NewsFetchLog.objects.bulk_create(
+            NewsFetchLog(bucket=b, country="us", language="en", fetched_at=timezone.now()) for b in SECTIONS
+        )
+        for url, flag in (
+            ("/api/news/home/", lambda r: r["X-News-Stale"]),
+            ("/api/news/async/home/", lambda r: r["X-News-Stale"]),
+            ("/api/news/category/world/", lambda r: r.json()["stale"]),
+            ("/api/news/async/category/world/", lambda r: r.json()["stale"]),
+        ):
+            with self.subTest(url=url):
+                NewsFetchLog.objects.update(fetched_at=timezone.now())
+                cache.clear()
+                with mock.patch("news.views.schedule_refresh") as schedule:
+                    etag = self.client.get(url)["ETag"]
+                    self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                schedule.assert_not_called()
+
+                NewsFetchLog.objects.update(fetched_at=timezone.now() - timedelta(days=2))
+                with mock.patch("news.views.schedule_refresh") as schedule:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+                self.assertIn(flag(response), ("true", True))
+                schedule.assert_called_once()
+
+
+class SharedSnapshotTests(NewsAPITestCase):
+    def test_off_unless_configured(self):
+        with self.settings():
+            del settings.NEWS_SHARED_SNAPSHOT
+            self.assertFalse(publish_shared_snapshot())
+            self.assertIsNone(get_shared_snapshot())
+
+    def test_fetch_log_skipped_by_a_busy_publish_is_picked_up(self):
+        NewsConfig.objects.filter(id=1).update(fetch_enabled=True)
+        old = timezone.now() - timedelta(days=2)
+        NewsFetchLog.objects.bulk_create(
+            NewsFetchLog(bucket=b, country="us", language="en", fetched_at=old) for b in SECTIONS
+        )
+        with tempfile.TemporaryDirectory() as tmp, override_settings(NEWS_SHARED_SNAPSHOT=os.path.join(tmp, "snap")):
+            publish_buckets(list(SECTIONS))
+
+            # Another process is mid-publish when the refresh commits, so this one skips it.
+            token = acquire_lease("shared-snapshot", ttl=30)
+            with self.captureOnCommitCallbacks(execute=True):
+                record_fetches("us", "en", {b: ("ok", 12) for b in SECTIONS})
+            release_lease("shared-snapshot", token)
+
+            with mock.patch("news.views.schedule_refresh") as schedule:
+                response = self.client.get("/api/news/home/")
+            self.assertEqual(response["X-Cache"], "SHARED")
+            self.assertEqual(response["X-News-Stale"], "false")
+            schedule.assert_not_called()
+
+
+class CategoryFeedTests(NewsAPITestCase):
+    def test_unknown_sections_are_404_without_side_effects(self):
+        NewsConfig.objects.filter(id=1).update(fetch_enabled=True)
+        cache.clear()
+        for url in ("/api/news/category/", "/api/news/async/category/"):
+            for category in ("nonsense", "x" * 300):
+                with self.subTest(url=url, category=category[:10]), mock.patch("news.views.schedule_refresh") as schedule:
+                    response = self.client.get(f"{url}{category}/")
+                    self.assertEqual(response.status_code, 404)
+                    schedule.assert_not_called()
+        self.assertFalse(NewsFetchLog.objects.exists())
+
+    def test_known_sections_are_case_insensitive(self):
+        store_news_items("world", [news_item("Summit opens", "https://example.com/summit")])
+        for url in ("/api/news/category/World/", "/api/news/async/category/WORLD/"):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["category"], "world")
+                self.assertEqual([i["title"] for i in response.json()["items"]], ["Summit opens"])
+
+
+@override_settings(NEWS_INGEST_LOCALES=["us:en", "in:hi"])
+class LocaleTests(NewsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        NewsConfig.objects.filter(id=1).update(fetch_enabled=True)
+        cache.clear()
+
+    def test_only_ingest_locales_are_refreshed_on_read(self):
+        cases = [({}, True), ({"country": "IN", "language": "hi"}, True), ({"country": "fr", "language": "fr"}, False)]
+        for url in ("/api/news/home/", "/api/news/category/world/"):
+            for params, refreshed in cases:
+                with self.subTest(url=url, params=params), mock.patch("news.views.schedule_refresh") as schedule:
+                    response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(schedule.called, refreshed)
+
+    def test_malformed_locales_are_400(self):
+        for params in ({"country": "united-states"}, {"language": "e"}, {"country": "u5"}):
+            for url in ("/api/news/home/", "/api/news/async/home/", "/api/news/category/world/"):
+                with self.subTest(url=url, params=params):
+                    self.assertEqual(self.client.get(url, params).status_code, 400)
+
+    def test_schedule_refresh_ignores_other_locales(self):
+        with mock.patch("news.ingestion._get_refresh_pool") as pool:
+            self.assertFalse(schedule_refresh({"world": ["world"]}, country="fr", language="fr"))
+        pool.assert_not_called()
+
+
+class AsyncRefreshTests(TestCase):
+    def test_breaker_and_lease_calls_stay_off_the_loop(self):
+        # async_to_sync runs the loop in its own thread; thread-sensitive sync work comes back here.
+        main, threads = threading.get_ident(), []
+
+        def record(result):
+            def call(*args):
+                threads.append(threading.get_ident())
+                return result
+            return call
+
+        breaker = mock.Mock(is_open=mock.Mock(side_effect=record(False)))
+        with mock.patch("news.ingestion.get_breaker", return_value=breaker), \
+                mock.patch("news.ingestion._claim_sections", return_value=({"world": "t"}, {"world": ["world"]}, {})), \
+                mock.patch("news.ingestion.afetch_sections", mock.AsyncMock(return_value={})), \
+                mock.patch("news.ingestion._store_fetched"), \
+                mock.patch("news.ingestion._release_leases", side_effect=record(None)) as release:
+            async_to_sync(arefresh_sections)({"world": ["world"]})
+        release.assert_called_once_with({"world": "t"}, None, "en")
+        self.assertEqual(threads, [main, main])
+
+    def test_open_breaker_skips_the_refresh(self):
+        breaker = mock.Mock(is_open=mock.Mock(return_value=True))
+        with mock.patch("news.ingestion.get_breaker", return_value=breaker), \
+                mock.patch("news.ingestion._claim_sections") as claim:
+            results = async_to_sync(arefresh_sections)({"world": ["world"]})
+        self.assertEqual(results, {"world": ("circuit_open", None)})
+        claim.assert_not_called()
+
+
+class AsyncClientTests(TestCase):
+    def test_one_http_client_per_loop_closed_with_the_loop(self):
+        client = AsyncNewsdataClient(metrics=get_client().metrics)
+        self.assertIs(client.metrics, get_client().metrics)
+        self.assertEqual(client.pool_size, 10)
+
+        async def sessions():
+            return await client._session(), await client._session()
+
+        first, again = asyncio.run(sessions())
+        self.assertIs(first, again)
+        self.assertTrue(first.is_closed)
+        second, _ = asyncio.run(sessions())
+        self.assertIsNot(second, first)
+        self.assertTrue(second.is_closed)
+        self.assertEqual(len(client._sessions), 1)
+
+
+class LeaseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_only_the_owner_releases(self):
+        token = acquire_lease("refresh:world")
+        self.assertIsNone(acquire_lease("refresh:world"))
+
+        release_lease("refresh:world", "someone-else")
+        self.assertIsNone(acquire_lease("refresh:world"))
+
+        release_lease("refresh:world", token)
+        self.assertIsNotNone(acquire_lease("refresh:world"))
+
+    def test_redis_release_is_one_compare_and_delete(self):
+        backend = mock.Mock(spec=RedisCache)
+        backend.make_and_validate_key.return_value = ":1:news:lease:refresh:world"
+        backend._cache._serializer.dumps.return_value = b"serialized-token"
+        with mock.patch("news.locks.caches", {"default": backend}):
+            release_lease("refresh:world", "token")
+
+        backend.make_and_validate_key.assert_called_once_with("news:lease:refresh:world")
+        redis = backend._cache.get_client.return_value
+        redis.eval.assert_called_once_with(COMPARE_AND_DELETE, 1, ":1:news:lease:refresh:world", b"serialized-token")
+        redis.get.assert_not_called()
+
+
+@override_settings(NEWS_DEDUPE_ENABLED=False, NEWSDATA_API_KEY="test-key")
+class BackfillTests(TestCase):
+    def test_publishes_once_per_run_not_per_batch(self):
+        pages = [
+            {"status": "success", "results": [{"title": f"Story {n}", "link": f"https://example.com/{n}"}],
+             "nextPage": f"p{n + 1}" if n < 3 else None}
+            for n in range(4)
+        ]
+        client = mock.Mock(get=mock.Mock(side_effect=pages))
+        checkpoint = NewsBackfillCheckpoint(bucket="world", country="us", language="en")
+        with mock.patch("news.backfill.get_client", return_value=client), \
+                mock.patch("news.ingestion.publish_buckets") as per_batch, \
+                mock.patch("news.backfill.publish_buckets") as per_run, \
+                self.captureOnCommitCallbacks(execute=True):
+            batches = list(run_backfill("world", ["world"], "us", "en", checkpoint, batch_size=1))
+
+        self.assertEqual(len(batches), 4)
+        self.assertEqual(NewsArticle.objects.count(), 4)
+        self.assertTrue(checkpoint.finished)
+        per_batch.assert_not_called()
+        per_run.assert_called_once_with(["world"])
+
+
+@override_settings(NEWSDATA_API_KEY="test-key", NEWSDATA_PAGE_SIZE=50, NEWS_BATCH_QUOTA=2, NEWS_BATCH_MAX_PAGES=5)
+class BatchedFetchTests(TestCase):
+    def provider(self, pages):
+        """A client whose get() serves `pages[category param]` in turn, recording every call."""
+        calls = []
+
+        def get(params, url=None):
+            calls.append(params)
+            served = pages[params["category"]]
+            n = sum(1 for c in calls if c["category"] == params["category"]) - 1
+            return {
+                "status": "success",
+                "results": served[n] if n < len(served) else [],
+                "nextPage": f"p{n + 1}" if n + 1 < len(served) else None,
+            }
+        return mock.Mock(get=mock.Mock(side_effect=get)), calls
+
+    @staticmethod
+    def raw(n, *categories):
+        return {"title": f"Story {n}", "link": f"https://example.com/{n}", "category": list(categories)}
+
+    def test_sections_are_packed_into_groups_of_five_categories(self):
+        client, calls = self.provider({
+            "business,education,politics,sports,technology": [[]],
+            "entertainment,health,world": [[]],
+        })
+        with mock.patch("news.ingestion.get_client", return_value=client):
+            fetched = fetch_sections_batched(SECTIONS, country="us")
+
+        self.assertEqual(sorted(fetched), sorted(SECTIONS))
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(c["size"] == 50 and c["country"] == "us" for c in calls))
+
+    def test_items_go_to_the_first_matching_section_with_room(self):
+        group = {"world": ["world"], "politics": ["politics"]}
+        client, calls = self.provider({"politics,world": [
+            [self.raw(1, "world", "politics"), self.raw(2, "world"), self.raw(3, "world", "politics"),
+             self.raw(4, "sports")],
+            [self.raw(5, "politics"), self.raw(6, "world")],
+        ]})
+        with mock.patch("news.ingestion.get_client", return_value=client):
+            fetched = fetch_sections_batched(group)
+
+        titles = {b: [it["title"] for it in items] for b, items in fetched.items()}
+        # The world quota (2) fills first, so the third world+politics story spills into politics.
+        self.assertEqual(titles, {"world": ["Story 1", "Story 2"], "politics": ["Story 3", "Story 5"]})
+        self.assertEqual(len(calls), 2)
+
+    def test_never_more_pages_than_sections(self):
+        group = {"world": ["world"], "politics": ["politics"]}
+        client, calls = self.provider({"politics,world": [[self.raw(n, "world")] for n in range(5)]})
+        with mock.patch("news.ingestion.get_client", return_value=client):
+            fetched = fetch_sections_batched(group)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual((len(fetched["world"]), len(fetched["politics"])), (2, 0))
+        self.assertEqual(calls[1]["page"], "p1")
+
+
+@override_settings(NEWS_LIVE_MAX_BATCH=2, NEWS_LIVE_MAX_CATCH_UP=5, NEWS_DEDUPE_ENABLED=False)
+class LiveCatchUpTests(TestCase):
+    def add(self, n, bucket="world"):
+        store_news_items(bucket, [news_item(f"Story {i}", f"https://example.com/{bucket}/{i}") for i in range(n)])
+
+    def test_replays_every_missed_row_in_pages(self):
+        self.add(3)
+        self.add(2, "sports")
+        frames = async_to_sync(catch_up)(0)
+
+        self.assertEqual([bucket for bucket, _, _ in frames], ["world", "sports"])
+        self.assertEqual(frames[-1][1], NewsArticle.objects.latest("id").id)
+        self.assertEqual(sum(frame.count(b'"title"') for _, _, frame in frames), 5)
+
+    def test_too_much_to_replay_is_none(self):
+        self.add(6)
+        self.assertIsNone(async_to_sync(catch_up)(0))
+        self.assertEqual(len(async_to_sync(catch_up)(0, ["sports"])), 0)
+
+    @override_settings(NEWS_LIVE_MAX_AGE=0)
+    async def test_stream_sends_reset_when_the_replay_is_too_long(self):
+        await sync_to_async(self.add)(6)
+        hub = mock.Mock(subscribe=mock.Mock(return_value=mock.Mock()))
+        with mock.patch("news.views.get_hub", return_value=hub):
+            response = await self.async_client.get("/api/news/stream/", {"last_event_id": "0"})
+            body = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertIn(b"event: reset\n", body)
+        self.assertNotIn(b"event: articles\n", body)
+        hub.unsubscribe.assert_called_once()
+
+
+@override_settings(NEWSDATA_API_KEY="test-key", NEWS_INGEST_LOCALES=["us:en"])
+class ProviderFailureTests(NewsAPITestCase):
+    def test_failed_fetch_is_logged_and_served_stale_without_refetching(self):
+        client = mock.Mock(get=mock.Mock(side_effect=NewsdataError("HTTP 503", "server_error")))
+        with mock.patch("news.ingestion.get_client", return_value=client), self.assertLogs("news.ingestion", "WARNING"):
+            results = refresh_sections({"world": ["world"]}, country="us", language="en", batched=False)
+
+        self.assertEqual(results, {"world": ("error", None)})
+        self.assertEqual(NewsFetchLog.objects.get(bucket="world").outcome, "error")
+
+        NewsConfig.objects.filter(id=1).update(fetch_enabled=True)
+        for url in ("/api/news/category/world/", "/api/news/async/category/world/"):
+            with self.subTest(url=url), mock.patch("news.views.schedule_refresh") as schedule:
+                self.assertIs(self.client.get(url).json()["stale"], True)
+                # Within NEWS_FETCH_RETRY_TTL it is not due again, failed or not.
+                schedule.assert_not_called()
+
+    def test_empty_answers_are_not_failures(self):
+        client = mock.Mock(get=mock.Mock(return_value={"status": "success", "results": []}))
+        with mock.patch("news.ingestion.get_client", return_value=client):
+            results = refresh_sections({"world": ["world"]}, country="us", language="en", batched=False)
+
+        self.assertEqual(results, {"world": ("empty", None)})
+        self.assertEqual(fresh_buckets(["world"], country="us", language="en"), {"world"})
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        for patcher in (mock.patch("news.breaker.time.time", side_effect=lambda: self.now),
+                        mock.patch("news.breaker.logger")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()  # a success resets the count
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertTrue(self.breaker.is_open())
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_lets_one_probe_through(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.now += 61
+        self.assertFalse(self.breaker.is_open())
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertFalse(self.breaker.allow())  # another worker's call while the probe is out
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens_for_a_full_cooldown(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.now += 61
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "open")
+        self.now += 30
+        self.assertFalse(self.breaker.allow())
+        self.now += 31
+        self.assertTrue(self.breaker.allow())
+
+
+class StubResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no JSON")
+        return self._body
+
+
+OK_BODY = {"status": "success", "results": []}
+
+
+class NewsdataClientTests(TestCase):
+    def setUp(self):
+        self.breaker = mock.Mock(allow=mock.Mock(return_value=True))
+        self.sleeps = []
+        for patcher in (
+            mock.patch("news.client.get_breaker", return_value=self.breaker),
+            mock.patch("news.client.time.sleep", side_effect=self.sleeps.append),
+            mock.patch("news.client.random.uniform", return_value=0.25),
+            mock.patch("news.client.logger"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = NewsdataClient(max_retries=2, backoff=0.5, backoff_max=10.0)
+
+    def serve(self, *responses):
+        self.client.session = mock.Mock(get=mock.Mock(side_effect=list(responses)))
+
+    def counts(self):
+        return {outcome: s["count"] for outcome, s in self.client.metrics.snapshot().items()}
+
+    def test_rate_limit_waits_for_retry_after(self):
+        self.serve(StubResponse(429, headers={"Retry-After": "3"}), StubResponse(200, OK_BODY))
+        self.assertEqual(self.client.get({"category": "world"}), OK_BODY)
+        self.assertEqual(self.sleeps, [3.0])
+        self.assertEqual(self.counts(), {"rate_limited": 1, "ok": 1})
+        self.breaker.record_success.assert_called_once()
+
+    def test_retry_after_may_be_an_http_date(self):
+        with mock.patch("news.client.time.time", return_value=1_700_000_000):
+            self.serve(StubResponse(429, headers={"Retry-After": "Tue, 14 Nov 2023 22:13:25 GMT"}),
+                       StubResponse(200, OK_BODY))
+            self.client.get({})
+        self.assertEqual(self.sleeps, [5.0])
+
+    def test_gives_up_when_retry_after_exceeds_the_backoff_cap(self):
+        self.serve(StubResponse(429, headers={"Retry-After": "120"}))
+        with self.assertRaises(NewsdataError) as ctx:
+            self.client.get({})
+        self.assertEqual(ctx.exception.outcome, "rate_limited")
+        self.assertEqual(self.sleeps, [])
+        self.breaker.record_failure.assert_called_once()
+
+    def test_server_errors_back_off_then_succeed(self):
+        self.serve(StubResponse(503), StubResponse(502), StubResponse(200, OK_BODY))
+        self.client.get({})
+        self.assertEqual(self.sleeps, [0.25, 0.25])
+        self.assertEqual(self.counts(), {"server_error": 2, "ok": 1})
+
+    def test_retries_are_bounded(self):
+        self.serve(*[StubResponse(500)] * 3)
+        with self.assertRaises(NewsdataError) as ctx:
+            self.client.get({})
+        self.assertEqual(ctx.exception.outcome, "server_error")
+        self.assertEqual(self.client.session.get.call_count, 3)
+        self.breaker.record_failure.assert_called_once()
+
+    def test_network_errors_are_retried_without_leaking_the_url(self):
+        self.client.session = mock.Mock(get=mock.Mock(side_effect=[
+            requests.ConnectionError("https://newsdata.io/api/1/news?apikey=secret"), StubResponse(200, OK_BODY),
+        ]))
+        self.client.get({})
+        self.assertEqual(self.counts(), {"network": 1, "ok": 1})
+
+        self.client.session = mock.Mock(get=mock.Mock(side_effect=requests.Timeout("apikey=secret")))
+        with self.assertRaises(NewsdataError) as ctx:
+            self.client.get({})
+        self.assertNotIn("secret", str(ctx.exception))
+
+    def test_provider_errors_fail_fast_and_do_not_trip_the_breaker(self):
+        self.serve(StubResponse(200, {"status": "error", "results": {"message": "Invalid category"}}))
+        with self.assertRaises(NewsdataError) as ctx:
+            self.client.get({})
+        self.assertEqual(ctx.exception.outcome, "provider_error")
+        self.assertEqual(self.client.session.get.call_count, 1)
+        self.breaker.record_failure.assert_not_called()
+        self.breaker.record_success.assert_called_once()
+
+    def test_non_json_bodies_count_against_the_breaker(self):
+        self.serve(StubResponse(200))
+        with self.assertRaises(NewsdataError) as ctx:
+            self.client.get({})
+        self.assertEqual(ctx.exception.outcome, "bad_response")
+        self.breaker.record_failure.assert_called_once()
+
+    def test_open_breaker_skips_the_network(self):
+        self.breaker.allow.return_value = False
+        self.serve()
+        with self.assertRaises(NewsdataError) as ctx:
+            self.client.get({})
+        self.assertEqual(ctx.exception.outcome, "circuit_open")
+        self.client.session.get.assert_not_called()
+        self.assertEqual(self.counts(), {"circuit_open": 1})
+
+
+@override_settings(NEWS_DEDUPE_ENABLED=False)
+class CardShapeTests(NewsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        store_news_items("world", [
+            news_item(f"Story {n}", f"https://example.com/{n}", summary="A fairly long summary of the story.")
+            for n in range(3)
+        ], country="us")
+
+    def test_fields_and_summary_chars(self):
+        for url in ("/api/news/home/", "/api/news/async/home/"):
+            with self.subTest(url=url):
+                response = self.client.get(url, {"fields": "summary,title", "summary_chars": "9"})
+                self.assertEqual(response.status_code, 200)
+                card = response.json()["world"][0]
+                self.assertEqual(list(card), ["title", "summary"])
+                self.assertEqual(card["summary"], "A fairly…")
+
+        page = self.client.get("/api/news/category/world/", {"fields": "url", "limit": 2}).json()
+        self.assertEqual([list(card) for card in page["items"]], [["url"], ["url"]])
+        rest = self.client.get("/api/news/category/world/", {"fields": "url", "limit": 2, "cursor": page["next"]})
+        self.assertEqual(len(rest.json()["items"]), 1)
+
+    def test_slim_shapes_select_fewer_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            get_db_sections(["world"], shape=CardShape(["title"]))
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertIn('"title"', sql)
+        self.assertNotIn('"summary"', sql)
+        self.assertNotIn('"alt_sources"', sql)
+
+    def test_shapes_have_their_own_cache_entries(self):
+        full = self.client.get("/api/news/category/world/")
+        slim = self.client.get("/api/news/category/world/", {"fields": "title"})
+        self.assertEqual(slim["X-Cache"], "MISS")
+        self.assertNotEqual(slim["ETag"], full["ETag"])
+        self.assertEqual(list(slim.json()["items"][0]), ["title"])
+
+    def test_bad_shapes_are_400(self):
+        for params in ({"fields": "title,password"}, {"summary_chars": "0"}, {"summary_chars": "ten"}):
+            for url in ("/api/news/home/", "/api/news/async/home/", "/api/news/category/world/",
+                        "/api/news/async/category/world/", "/api/news/search/?q=story"):
+                with self.subTest(url=url, params=params):
+                    self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+@override_settings(API_COMPRESS_MIN_BYTES=100)
+class CompressionMiddlewareTests(TestCase):
+    body = json.dumps({"items": ["the same words again"] * 50}).encode()
+
+    def respond(self, accept="", path="/api/news/home/", response=None):
+        if response is None:
+            response = HttpResponse(self.body, content_type="application/json")
+            response["ETag"] = '"abc"'
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda r: response)(request)
+
+    def test_gzip(self):
+        response = self.respond("gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_brotli_is_preferred_when_available(self):
+        fake = mock.Mock(compress=mock.Mock(return_value=b"tiny"))
+        with mock.patch("backend.middleware.brotli", fake):
+            self.assertEqual(self.respond("gzip, br")["Content-Encoding"], "br")
+            self.assertEqual(self.respond("gzip, br;q=0")["Content-Encoding"], "gzip")
+        with mock.patch("backend.middleware.brotli", None):
+            self.assertEqual(self.respond("br, gzip")["Content-Encoding"], "gzip")
+
+    def test_left_alone(self):
+        small = HttpResponse(b'{"a": 1}', content_type="application/json")
+        streaming = StreamingHttpResponse(iter([self.body]), content_type="text/event-stream")
+        image = HttpResponse(self.body, content_type="image/png")
+        cases = {
+            "no accepted encoding": self.respond(""),
+            "refused with q=0": self.respond("gzip;q=0"),
+            "under the size threshold": self.respond("gzip", response=small),
+            "streaming": self.respond("gzip", response=streaming),
+            "not compressible": self.respond("gzip", response=image),
+            "outside the API": self.respond("gzip", path="/admin/"),
+        }
+        for case, response in cases.items():
+            with self.subTest(case):
+                self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(cases["no accepted encoding"]["ETag"], '"abc"')
+        self.assertIn("Accept-Encoding", cases["under the size threshold"]["Vary"])
@@ -1,7 +1,18 @@
 from django.urls import path
-from .views import HomeNewsView, CategoryNewsView
+from .views import (
+    HomeNewsView, CategoryNewsView, NewsSearchView, NewsCacheStatsView, NewsProviderStatsView,
+    AsyncHomeNewsView, AsyncCategoryNewsView, NewsStreamView, NewsSyncView,
+)
 
 urlpatterns = [
     path("home/", HomeNewsView.as_view(), name="news-home"),
     path("category/<str:category>/", CategoryNewsView.as_view(), name="news-category"),
+    # Async variants, for the ASGI deployment (backend.asgi)
+    path("async/home/", AsyncHomeNewsView.as_view(), name="news-home-async"),
+    path("async/category/<str:category>/", AsyncCategoryNewsView.as_view(), name="news-category-async"),
+    path("stream/", NewsStreamView.as_view(), name="news-stream"),
+    path("sync/", NewsSyncView.as_view(), name="news-sync"),
+    path("search/", NewsSearchView.as_view(), name="news-search"),
+    path("cache-stats/", NewsCacheStatsView.as_view(), name="news-cache-stats"),
+    path("provider-stats/", NewsProviderStatsView.as_view(), name="news-provider-stats"),
 ]
@@ -1,279 +1,493 @@
-from datetime import date
-import requests
+import asyncio
+import re
 
 from django.conf import settings
-from django.utils.dateparse import parse_datetime
-from django.db.models import DateField, DateTimeField
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views import View
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
+from rest_framework.exceptions import NotFound, ValidationError
+
+from backend.renderers import dumps
+
+from .breaker import get_breaker
+from .cache import (
+    FETCH_LOG, abucket_generations, aget_cached_response, aresponse_version, aset_cached_response,
+    bucket_generations, cache_stats, get_cached_response, response_version, set_cached_response,
+)
+from .client import get_client
+from .config import aget_news_config, get_news_config
+from .ingestion import (
+    SECTIONS, afreshness, aschedule_refresh, freshness, ingest_locales, schedule_refresh,
+)
+from .live import catch_up, get_hub, sse_frame
+from .queries import (
+    CardShape, aget_db_section_page, aget_db_sections, get_db_section_page, get_db_sections, serialize_article,
+)
+from .search import search_articles
+from .shared import acurrent_snapshot, current_snapshot
+from .snapshots import PAGE_SIZE, aload_snapshots, category_body, home_body, load_snapshots
+from .sync import SyncReset, changes_since
 
-from .models import NewsArticle, NewsConfig
-
-# Newsdata: prefer the /news endpoint (stable)
-NEWSDATA_URL = "https://newsdata.io/api/1/news"
-
-
-# ------ Helpers ------
-
-def _normalize_item(item: dict) -> dict:
-    """Convert a NewsData.io item into a consistent dict our frontend expects."""
-    return {
-        "title": item.get("title"),
-        "summary": item.get("description") or item.get("content"),
-        "url": item.get("link"),
-        "image": item.get("image_url"),
-        "source": item.get("source_id"),
-        "pubDate": item.get("pubDate"),
-        "category": item.get("category") or [],
-        "country": item.get("country") or [],
-    }
-
-
-def _serialize_article(a: NewsArticle) -> dict:
-    """Serialize DB model -> response dict (same shape as _normalize_item)."""
-    return {
-        "title": a.title,
-        "summary": a.summary,
-        "url": a.url,
-        "image": a.image,
-        "source": a.source,
-        "pubDate": a.pubDate.isoformat() if a.pubDate else None,
-        "category": [a.category] if a.category else [],
-        "country": [a.country] if a.country else [],
-    }
-
-
-def fetch_from_newsdata(categories=None, country=None, language="en"):
-    """Call the external Newsdata API once and normalize results."""
-    api_key = getattr(settings, "NEWSDATA_API_KEY", None)
-    if not api_key:
-        return []
-
-    params = {"apikey": api_key, "language": language}
-    if categories:
-        params["category"] = ",".join(categories) if isinstance(categories, (list, tuple)) else str(categories)
-    if country:
-        params["country"] = ",".join(country) if isinstance(country, (list, tuple)) else str(country)
-
-    try:
-        resp = requests.get(NEWSDATA_URL, params=params, timeout=12)
-        data = resp.json()
-        if not isinstance(data, dict) or data.get("status") != "success":
-            return []
-        results = data.get("results") or []
-        return [_normalize_item(x) for x in results]
-    except Exception:
-        return []
-
-
-def store_news_items(bucket: str, items: list, country: str = "", max_save: int = 24) -> None:
-    """Save normalized items to DB under a specific 'bucket' (our section)."""
-    count = 0
-    for it in items:
-        if count >= max_save:
-            break
-        title = (it.get("title") or "").strip()
-        url = (it.get("url") or "").strip() or None
-        image = (it.get("image") or "").strip() or None
-        source = (it.get("source") or "").strip() or None
-
-        pub_dt = None
-        raw_pub = it.get("pubDate")
-        if raw_pub:
-            pub_dt = parse_datetime(raw_pub)
-
-        lookup = {"url": url} if url else {"title": title, "category": bucket}
-
-        NewsArticle.objects.update_or_create(
-            **lookup,
-            defaults={
-                "title": title or "Untitled",
-                "summary": it.get("summary") or "",
-                "image": image,
-                "source": source,
-                "pubDate": pub_dt,
-                "category": bucket,
-                "country": country or "",
-            },
-        )
-        count += 1
 
+# ------ Views ------
 
-def get_db_section(bucket: str, limit: int = 12) -> list:
-    """Read latest items for a given bucket from DB."""
-    qs = (
-        NewsArticle.objects
-        .filter(category=bucket)
-        .order_by("-pubDate", "-id")[:limit]
+def _with_validators(response, version):
+    """ETag, Last-Modified and shared-cache lifetimes for a feed response."""
+    _, etag, last_modified = version
+    response["ETag"] = quote_etag(etag)
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(
+        response, public=True,
+        max_age=getattr(settings, "NEWS_HTTP_MAX_AGE", 0),
+        s_maxage=getattr(settings, "NEWS_HTTP_S_MAXAGE", 60),
     )
-    return [_serialize_article(a) for a in qs]
+    return response
 
 
-def _fetched_today(bucket: str) -> bool:
-    """Check if this bucket was already fetched today, works with both DateField & DateTimeField."""
-    field = NewsArticle._meta.get_field("fetched_at")
+def _not_modified(request, version):
+    """A 304 if the client's If-None-Match / If-Modified-Since is still current, else None."""
+    _, etag, last_modified = version
+    response = get_conditional_response(request, etag=quote_etag(etag), last_modified=last_modified)
+    return _with_validators(response, version) if response is not None else None
 
-    if isinstance(field, DateField) and not isinstance(field, DateTimeField):
-        # Fetched_at is a pure DateField
-        return NewsArticle.objects.filter(category=bucket, fetched_at=date.today()).exists()
 
-    # Otherwise, DateTimeField
-    return NewsArticle.objects.filter(category=bucket, fetched_at__date=date.today()).exists()
+LOCALE_CODE = re.compile(r"[a-z]{2,3}")
 
 
-# ------ Views ------
+def _locale(params):
+    """(country, language, refreshable) from ?country=&language=; raises ValueError({param: message}).
+
+    Only NEWS_INGEST_LOCALES are refreshed on read. Any other well-formed
+    locale is served what is stored, with no freshness check or refresh.
+    """
+    country = (params.get("country") or "us").strip().lower()
+    language = (params.get("language") or "en").strip().lower()
+    for name, value in (("country", country), ("language", language)):
+        if not LOCALE_CODE.fullmatch(value):
+            raise ValueError({name: "Must be a 2 or 3 letter code."})
+    return country, language, (country, language) in ingest_locales()
+
+
+def _json_response(body: bytes, cache_state: str, version, stale=None) -> HttpResponse:
+    """Already-encoded JSON straight to the client, bypassing DRF rendering.
+
+    The home payload is nothing but sections, so its staleness travels in X-News-Stale.
+    """
+    response = HttpResponse(body, content_type="application/json", headers={"X-Cache": cache_state})
+    if stale is not None:
+        response["X-News-Stale"] = "true" if stale else "false"
+    return _with_validators(response, version)
+
 
 class HomeNewsView(APIView):
-    """GET /api/news/home/?country=in&language=en"""
+    """GET /api/news/home/?country=in&language=en&fields=title,image,url&summary_chars=120"""
 
     permission_classes = [permissions.AllowAny]
 
-    SECTIONS = {
-        "technology": ["technology"],
-        "politics": ["politics"],
-        "education": ["education"],
-        "business": ["business"],
-        "sports": ["sports"],
-        "health": ["health"],
-        "entertainment": ["entertainment"],
-        "world": ["world"],
-    }
+    SECTIONS = SECTIONS
 
     def get(self, request):
-        country = request.query_params.get("country", "us")
-        language = request.query_params.get("language", "en")
+        try:
+            country, language, refreshable = _locale(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+        try:
+            shape = CardShape.from_params(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+
+        # The fetch log's generation too: the shared snapshot's copy of it drives `stale`.
+        generations = bucket_generations([*self.SECTIONS, FETCH_LOG])
+        # The host's mapped snapshot serves the full feed with no query and no
+        # per-worker copy, so the response cache is only for the fallback.
+        shared = current_snapshot(self.SECTIONS, generations)
+        config = get_news_config()
+
+        # Stale-while-revalidate: always answer from the DB, refresh off-thread.
+        # During a provider outage (breaker open) no refresh is queued and the
+        # stored rows are served as-is; sections whose last fetch failed are
+        # flagged in X-News-Stale even before they are due again. This runs
+        # before the conditional GET, so revalidating clients keep refreshes coming.
+        stale = set()
+        if config.fetch_enabled and refreshable:
+            log = shared.fetch_log(country, language) if shared is not None else None
+            fresh, failed = freshness(self.SECTIONS, country=country, language=language, log=log)
+            due = {b: cats for b, cats in self.SECTIONS.items() if b not in fresh}
+            if due:
+                schedule_refresh(due, country=country, language=language)
+            stale = set(due) | failed
+
+        version = response_version(
+            "home", self.SECTIONS, country=country, language=language,
+            extra=f"{shape.token}:{','.join(sorted(stale))}", generations=generations,
+        )
+        not_modified = _not_modified(request, version)
+        if not_modified is not None:
+            return not_modified
 
-        config, _ = NewsConfig.objects.get_or_create(id=1)
-        payload = {}
+        if shared is not None and shape.is_full:
+            return _json_response(home_body(self.SECTIONS, shared.sections), "SHARED", version, stale=bool(stale))
+        key = version[0]
+        body = get_cached_response(key)
+        if body is not None:
+            return _json_response(body, "HIT", version, stale=bool(stale))
 
-        for bucket, api_categories in self.SECTIONS.items():
-            if config.fetch_enabled and not _fetched_today(bucket):
-                items = fetch_from_newsdata(categories=api_categories, country=country, language=language)
-                if items:
-                    store_news_items(bucket=bucket, items=items, country=country)
-                payload[bucket] = get_db_section(bucket)
-            else:
-                payload[bucket] = get_db_section(bucket)
+        # Snapshots hold full cards; slim ones are cheaper to query than to cut down.
+        snapshots = load_snapshots(self.SECTIONS) if shape.is_full else {}
+        if len(snapshots) == len(self.SECTIONS):
+            body = home_body(self.SECTIONS, snapshots)
+        else:
+            body = dumps(get_db_sections(self.SECTIONS, shape=shape))
+        set_cached_response(key, body)
 
-        return Response(payload)
+        return _json_response(body, "MISS", version, stale=bool(stale))
 
 
 class CategoryNewsView(APIView):
-    """GET /api/news/category/<category>/?country=in&language=en"""
+    """GET /api/news/category/<category>/?country=in&language=en&limit=20&cursor=<next>&fields=...&summary_chars=..."""
 
     permission_classes = [permissions.AllowAny]
 
+    MAX_LIMIT = 50
+
     def get(self, request, category: str):
         bucket = category.lower().strip()
-        country = request.query_params.get("country", "us")
-        language = request.query_params.get("language", "en")
-
-        config, _ = NewsConfig.objects.get_or_create(id=1)
-
-        if config.fetch_enabled and not _fetched_today(bucket):
-            items = fetch_from_newsdata(categories=[bucket], country=country, language=language)
-            if items:
-                store_news_items(bucket=bucket, items=items, country=country)
-
-        data = get_db_section(bucket, limit=20)
-        return Response({"category": bucket, "items": data})
-
-    
-    
-    
-# ------ OLD CODE (for reference) ------
-
-# from django.conf import settings
-# from django.core.cache import cache
-# from rest_framework.views import APIView
-# from rest_framework.response import Response
-# from rest_framework import permissions
-# import requests
-
-# # Use the /latest endpoint instead of /news to avoid pagination errors
-# NEWSDATA_URL = "https://newsdata.io/api/1/latest"
-
-# def _normalize(item):
-#     """
-#     Convert a NewsData.io item into a clean card dictionary.
-#     """
-#     return {
-#         "title": item.get("title"),
-#         "summary": item.get("description") or item.get("content"),
-#         "url": item.get("link"),
-#         "image": item.get("image_url"),
-#         "source": item.get("source_id"),
-#         "pubDate": item.get("pubDate"),
-#         "category": item.get("category", []),
-#         "country": item.get("country", []),
-#     }
-
-# def fetch_news(categories=None, country=None, language="en", size=12):
-#     api_key = getattr(settings, "NEWSDATA_API_KEY", None)
-#     if not api_key:
-#         print("⚠️ Missing NEWSDATA_API_KEY in settings")
-#         return []
-
-#     params = {"apikey": api_key, "language": language}
-#     if categories:
-#         params["category"] = ",".join(categories) if isinstance(categories, (list, tuple)) else categories
-#     if country:
-#         params["country"] = ",".join(country) if isinstance(country, (list, tuple)) else country
-
-#     cache_key = f"news:{categories}:{country}:{language}:{size}"
-#     cached = cache.get(cache_key)
-#     if cached:
-#         return cached
-
-#     try:
-#         response = requests.get(NEWSDATA_URL, params=params, timeout=10)
-#         data = response.json()
-
-#         print("Fetching:", response.url)
-#         print("Raw response:", data)
-
-#         # Ensure proper format
-#         if not isinstance(data, dict) or data.get("status") != "success":
-#             print("⚠️ API returned error:", data)
-#             return []
-
-#         results = data.get("results", []) or []
-#         normalized = [_normalize(item) for item in results]
-#         cache.set(cache_key, normalized, 60 * 10)  # cache 10 minutes
-#         return normalized
-
-#     except Exception as e:
-#         print("❌ Error fetching news:", e)
-#         return []
-
-# class HomeNewsView(APIView):
-#     permission_classes = [permissions.AllowAny]
-
-#     def get(self, request):
-#         country = request.query_params.get("country", "us")
-#         language = request.query_params.get("language", "en")
-
-#         sections = {
-#             "technology": ["technology"],
-#             "politics": ["politics"],
-#             "education": ["education"],
-#             "business": ["business"],
-#             "sports": ["sports"],
-#             "health": ["health"],
-#             "entertainment": ["entertainment"],
-#             "world": ["world"],
-#         }
-
-#         payload = {key: fetch_news(categories=cats, country=country, language=language) for key, cats in sections.items()}
-#         return Response(payload)
-
-# class CategoryNewsView(APIView):
-#     permission_classes = [permissions.AllowAny]
-
-#     def get(self, request, category):
-#         country = request.query_params.get("country", "us")
-#         language = request.query_params.get("language", "en")
-#         items = fetch_news(categories=[category], country=country, language=language)
-#         return Response({"category": category, "items": items})
+        if bucket not in SECTIONS:
+            # Before any cache, fetch-log or provider work: the path segment is arbitrary input.
+            raise NotFound(f"Unknown section: {category[:50]}.")
+        try:
+            country, language, refreshable = _locale(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+        cursor = request.query_params.get("cursor") or None
+        try:
+            limit = min(max(int(request.query_params.get("limit", PAGE_SIZE)), 1), self.MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        try:
+            shape = CardShape.from_params(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+
+        config = get_news_config()
+
+        # Before the conditional GET, as on the home feed; the flag is in the body, so also in the ETag.
+        stale = False
+        if config.fetch_enabled and refreshable:
+            fresh, failed = freshness([bucket], country=country, language=language)
+            if bucket not in fresh:
+                schedule_refresh({bucket: [bucket]}, country=country, language=language)
+            stale = bucket not in fresh or bucket in failed
+
+        version = response_version(
+            "category", [bucket], country=country, language=language, category=bucket,
+            extra=f"{limit}:{cursor or ''}:{shape.token}:{int(stale)}",
+        )
+        not_modified = _not_modified(request, version)
+        if not_modified is not None:
+            return not_modified
+        key = version[0]
+        body = get_cached_response(key)
+        if body is not None:
+            return _json_response(body, "HIT", version)
+
+        # The default first page is exactly what the bucket's snapshot holds.
+        default_page = not cursor and limit == PAGE_SIZE and shape.is_full
+        snapshot = load_snapshots([bucket]).get(bucket) if default_page else None
+        if snapshot is not None:
+            body = category_body(bucket, snapshot, stale)
+        else:
+            try:
+                data, next_cursor = get_db_section_page(bucket, limit=limit, cursor=cursor, shape=shape)
+            except ValueError:
+                raise ValidationError({"cursor": "Invalid cursor."})
+            payload = {"category": bucket, "items": data, "stale": stale, "next": next_cursor}
+            body = dumps(payload)
+        set_cached_response(key, body)
+        return _json_response(body, "MISS", version)
+
+
+# ------ Async views (ASGI) ------
+#
+# The same endpoints on the async ORM and cache API, for deployments served by
+# backend.asgi: a request waiting on the DB or cache holds no thread. Plain
+# Django views, as DRF's APIView has no async handlers; the responses are
+# byte-for-byte those of the sync views.
+
+def _aschedule(request, sections: dict, country, language) -> None:
+    # Under ASGI the event loop outlives the request, so the refresh can run on
+    # it; an async view served by WSGI gets a throwaway loop, so use the pool.
+    if hasattr(request, "scope"):
+        aschedule_refresh(sections, country=country, language=language)
+    else:
+        schedule_refresh(sections, country=country, language=language)
+
+
+def _error(status: int, errors: dict) -> HttpResponse:
+    return HttpResponse(dumps(errors), status=status, content_type="application/json")
+
+
+def _bad_request(errors: dict) -> HttpResponse:
+    return _error(400, errors)
+
+
+class AsyncHomeNewsView(View):
+    """GET /api/news/async/home/?country=in&language=en&fields=...&summary_chars=..."""
+
+    http_method_names = ["get", "head", "options"]
+
+    SECTIONS = SECTIONS
+
+    async def get(self, request):
+        try:
+            country, language, refreshable = _locale(request.GET)
+        except ValueError as exc:
+            return _bad_request(exc.args[0])
+        try:
+            shape = CardShape.from_params(request.GET)
+        except ValueError as exc:
+            return _bad_request(exc.args[0])
+
+        generations = await abucket_generations([*self.SECTIONS, FETCH_LOG])
+        shared = await acurrent_snapshot(self.SECTIONS, generations)
+        config = await aget_news_config()
+
+        stale = set()
+        if config.fetch_enabled and refreshable:
+            log = shared.fetch_log(country, language) if shared is not None else None
+            fresh, failed = await afreshness(self.SECTIONS, country=country, language=language, log=log)
+            due = {b: cats for b, cats in self.SECTIONS.items() if b not in fresh}
+            if due:
+                _aschedule(request, due, country, language)
+            stale = set(due) | failed
+
+        version = await aresponse_version(
+            "home", self.SECTIONS, country=country, language=language,
+            extra=f"{shape.token}:{','.join(sorted(stale))}", generations=generations,
+        )
+        not_modified = _not_modified(request, version)
+        if not_modified is not None:
+            return not_modified
+
+        if shared is not None and shape.is_full:
+            return _json_response(home_body(self.SECTIONS, shared.sections), "SHARED", version, stale=bool(stale))
+        key = version[0]
+        body = await aget_cached_response(key)
+        if body is not None:
+            return _json_response(body, "HIT", version, stale=bool(stale))
+
+        snapshots = await aload_snapshots(self.SECTIONS) if shape.is_full else {}
+        if len(snapshots) == len(self.SECTIONS):
+            body = home_body(self.SECTIONS, snapshots)
+        else:
+            body = dumps(await aget_db_sections(self.SECTIONS, shape=shape))
+        await aset_cached_response(key, body)
+
+        return _json_response(body, "MISS", version, stale=bool(stale))
+
+
+class AsyncCategoryNewsView(View):
+    """GET /api/news/async/category/<category>/?country=in&language=en&limit=20&cursor=<next>&fields=...&summary_chars=..."""
+
+    http_method_names = ["get", "head", "options"]
+
+    MAX_LIMIT = CategoryNewsView.MAX_LIMIT
+
+    async def get(self, request, category: str):
+        bucket = category.lower().strip()
+        if bucket not in SECTIONS:
+            return _error(404, {"detail": f"Unknown section: {category[:50]}."})
+        try:
+            country, language, refreshable = _locale(request.GET)
+        except ValueError as exc:
+            return _bad_request(exc.args[0])
+        cursor = request.GET.get("cursor") or None
+        try:
+            limit = min(max(int(request.GET.get("limit", PAGE_SIZE)), 1), self.MAX_LIMIT)
+        except ValueError:
+            return _bad_request({"limit": "Must be an integer."})
+        try:
+            shape = CardShape.from_params(request.GET)
+        except ValueError as exc:
+            return _bad_request(exc.args[0])
+
+        config = await aget_news_config()
+
+        stale = False
+        if config.fetch_enabled and refreshable:
+            fresh, failed = await afreshness([bucket], country=country, language=language)
+            if bucket not in fresh:
+                _aschedule(request, {bucket: [bucket]}, country, language)
+            stale = bucket not in fresh or bucket in failed
+
+        version = await aresponse_version(
+            "category", [bucket], country=country, language=language, category=bucket,
+            extra=f"{limit}:{cursor or ''}:{shape.token}:{int(stale)}",
+        )
+        not_modified = _not_modified(request, version)
+        if not_modified is not None:
+            return not_modified
+        key = version[0]
+        body = await aget_cached_response(key)
+        if body is not None:
+            return _json_response(body, "HIT", version)
+
+        default_page = not cursor and limit == PAGE_SIZE and shape.is_full
+        snapshot = (await aload_snapshots([bucket])).get(bucket) if default_page else None
+        if snapshot is not None:
+            body = category_body(bucket, snapshot, stale)
+        else:
+            try:
+                data, next_cursor = await aget_db_section_page(bucket, limit=limit, cursor=cursor, shape=shape)
+            except ValueError:
+                return _bad_request({"cursor": "Invalid cursor."})
+            payload = {"category": bucket, "items": data, "stale": stale, "next": next_cursor}
+            body = dumps(payload)
+        await aset_cached_response(key, body)
+        return _json_response(body, "MISS", version)
+
+
+class NewsStreamView(View):
+    """GET /api/news/stream/?buckets=world,sports (text/event-stream, ASGI only)
+
+    Pushes an "articles" event with the new rows of a bucket whenever
+    ingestion adds some (see news.live). Reconnects with Last-Event-ID (or
+    ?last_event_id=) first replay what was missed, or get a "reset" event
+    if that is too much to replay.
+    """
+
+    http_method_names = ["get", "options"]
+
+    async def get(self, request):
+        if not hasattr(request, "scope"):
+            # WSGI would buffer the endless stream and pin a worker thread per client.
+            return HttpResponse(
+                dumps({"detail": "Live updates need the ASGI server (backend.asgi)."}),
+                status=501, content_type="application/json",
+            )
+
+        buckets = [b.strip().lower() for b in request.GET.get("buckets", "").split(",") if b.strip()]
+        unknown = sorted(set(buckets) - set(SECTIONS))
+        if unknown:
+            return _bad_request({"buckets": f"Unknown section(s): {', '.join(unknown)}."})
+        try:
+            last_id = int(request.headers.get("Last-Event-ID") or request.GET.get("last_event_id") or -1)
+        except ValueError:
+            return _bad_request({"last_event_id": "Must be an integer."})
+
+        response = StreamingHttpResponse(
+            self._stream(buckets or None, last_id if last_id >= 0 else None),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+        return response
+
+    async def _stream(self, buckets, last_id):
+        hub = get_hub()
+        # Subscribe before catching up so nothing falls in between.
+        sub = hub.subscribe(buckets)
+        heartbeat = getattr(settings, "NEWS_LIVE_HEARTBEAT", 15)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + getattr(settings, "NEWS_LIVE_MAX_AGE", 300)
+        seen = last_id or 0
+        try:
+            yield b"retry: 3000\n\n"
+            if last_id is not None:
+                frames = await catch_up(last_id, buckets)
+                if frames is None:
+                    # Too much was missed to replay; the client reloads and carries on from the live frames.
+                    yield sse_frame("reset", dumps({"detail": "Too many missed articles; reload the feed."}))
+                for _, event_id, frame in frames or ():
+                    seen = max(seen, event_id)
+                    yield frame
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    event_id, frame = await asyncio.wait_for(sub.queue.get(), timeout=min(heartbeat, remaining))
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if event_id > seen:
+                    yield frame
+        finally:
+            hub.unsubscribe(sub)
+
+
+class NewsSearchView(APIView):
+    """GET /api/news/search/?q=climate+policy&category=world&country=us&limit=20&fields=...&summary_chars=..."""
+
+    permission_classes = [permissions.AllowAny]
+
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        query = (request.query_params.get("q") or "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required."})
+        category = (request.query_params.get("category") or "").lower().strip() or None
+        country = (request.query_params.get("country") or "").strip() or None
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), self.MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        try:
+            shape = CardShape.from_params(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+
+        results = search_articles(query, category=category, country=country, limit=limit)
+        return Response({"query": query, "items": [serialize_article(a, shape) for a in results]})
+
+
+class NewsSyncView(APIView):
+    """GET /api/news/sync/?since=<token>&buckets=world,sports&limit=500
+
+    Articles inserted or updated, and ids deleted, since the client's token.
+    Omit `since` for a full sync; keep requesting `next` while `more` is true.
+    A token that can no longer be served answers {"reset": true}: drop local
+    state and sync again without one.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    MAX_LIMIT = 1000
+
+    def get(self, request):
+        buckets = [b.strip().lower() for b in request.query_params.get("buckets", "").split(",") if b.strip()]
+        unknown = sorted(set(buckets) - set(SECTIONS))
+        if unknown:
+            raise ValidationError({"buckets": f"Unknown section(s): {', '.join(unknown)}."})
+        try:
+            limit = min(max(int(request.query_params.get("limit", 500)), 1), self.MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+
+        try:
+            payload = changes_since(request.query_params.get("since") or None, limit=limit, buckets=buckets or None)
+        except SyncReset:
+            return Response({"reset": True, "changed": [], "deleted": [], "next": None, "more": False})
+        payload["reset"] = False
+        return Response(payload)
+
+
+class NewsCacheStatsView(APIView):
+    """GET /api/news/cache-stats/ (staff only)"""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class NewsProviderStatsView(APIView):
+    """GET /api/news/provider-stats/ (staff only): breaker state and this process's Newsdata call metrics."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({"breaker": get_breaker().state, "calls": get_client().metrics.snapshot()})